@@ -68,7 +68,8 @@ from . properties import M3SceneProperties
 from . utils.registration import get_core, get_tools, get_pie_menus, get_menus
 from . utils.registration import register_classes, unregister_classes, register_keymaps, unregister_keymaps, register_icons, unregister_icons, add_object_context_menu, remove_object_context_menu
 from . utils.registration import add_object_buttons
-from . handlers import update_object_axes_drawing
+from . handlers import update_object_axes_drawing, prune_graph_cache, clear_graph_cache_on_load, update_depsgraph_caches, resubscribe_selection_stats, reset_bounds_index, rebuild_bounds_on_frame_change, reset_boundary_cache
+from . utils.selection import subscribe_selection_stats, unsubscribe_selection_stats
 
 
 # TODO: support translation, see https://blendermarket.com/inbox/conversations/20371
@@ -111,6 +112,22 @@ def register():
     bpy.app.handlers.redo_pre.append(update_object_axes_drawing)
     bpy.app.handlers.load_pre.append(update_object_axes_drawing)
 
+    bpy.app.handlers.undo_post.append(prune_graph_cache)
+    bpy.app.handlers.redo_post.append(prune_graph_cache)
+    bpy.app.handlers.load_pre.append(clear_graph_cache_on_load)
+
+    bpy.app.handlers.depsgraph_update_post.append(update_depsgraph_caches)
+    bpy.app.handlers.load_post.append(resubscribe_selection_stats)
+    bpy.app.handlers.undo_post.append(reset_bounds_index)
+    bpy.app.handlers.redo_post.append(reset_bounds_index)
+    bpy.app.handlers.load_pre.append(reset_bounds_index)
+    bpy.app.handlers.frame_change_post.append(rebuild_bounds_on_frame_change)
+    bpy.app.handlers.undo_post.append(reset_boundary_cache)
+    bpy.app.handlers.redo_post.append(reset_boundary_cache)
+    bpy.app.handlers.load_pre.append(reset_boundary_cache)
+
+    subscribe_selection_stats()
+
 
     # REGISTRATION OUTPUT
 
@@ -126,6 +143,22 @@ def unregister():
     bpy.app.handlers.redo_pre.remove(update_object_axes_drawing)
     bpy.app.handlers.load_pre.remove(update_object_axes_drawing)
 
+    bpy.app.handlers.undo_post.remove(prune_graph_cache)
+    bpy.app.handlers.redo_post.remove(prune_graph_cache)
+    bpy.app.handlers.load_pre.remove(clear_graph_cache_on_load)
+
+    bpy.app.handlers.depsgraph_update_post.remove(update_depsgraph_caches)
+    bpy.app.handlers.load_post.remove(resubscribe_selection_stats)
+    bpy.app.handlers.undo_post.remove(reset_bounds_index)
+    bpy.app.handlers.redo_post.remove(reset_bounds_index)
+    bpy.app.handlers.load_pre.remove(reset_bounds_index)
+    bpy.app.handlers.frame_change_post.remove(rebuild_bounds_on_frame_change)
+    bpy.app.handlers.undo_post.remove(reset_boundary_cache)
+    bpy.app.handlers.redo_post.remove(reset_boundary_cache)
+    bpy.app.handlers.load_pre.remove(reset_boundary_cache)
+
+    unsubscribe_selection_stats()
+
 
     # TOOLS, PIE MENUS, KEYMAPS, MENUS
 
@@ -1,7 +1,53 @@
 from bpy.app.handlers import persistent
 from . utils.draw import remove_object_axes_drawing_handler
+from . utils.graph import clear_graph_cache
+from . utils.selection import clear_selection_stats, subscribe_selection_stats
+from . utils.bounds import mark_bounds_dirty, clear_bounds_index
+from . utils.mesh import clear_boundary_cache
 
 
 @persistent
 def update_object_axes_drawing(none):
     remove_object_axes_drawing_handler()
+
+
+@persistent
+def prune_graph_cache(none):
+    # the topology signature already catches changed meshes, so undo and redo only need to drop graphs of meshes that are gone
+    clear_graph_cache(prune=True)
+
+
+@persistent
+def clear_graph_cache_on_load(none):
+    clear_graph_cache()
+
+
+@persistent
+def update_depsgraph_caches(scene, depsgraph=None):
+    clear_selection_stats()
+    mark_bounds_dirty(scene, depsgraph)
+
+
+@persistent
+def rebuild_bounds_on_frame_change(scene, depsgraph=None):
+    # animated, driven and constrained objects don't show up as depsgraph updates on frame changes
+    mark_bounds_dirty(scene)
+
+
+@persistent
+def reset_bounds_index(none):
+    # undo and redo can change any object's transform, without them showing up as depsgraph updates
+    clear_bounds_index()
+
+
+@persistent
+def reset_boundary_cache(none):
+    # the edit mesh is rebuilt on undo and redo, so the cached vert indices can no longer be trusted
+    clear_boundary_cache()
+
+
+@persistent
+def resubscribe_selection_stats(none):
+    # msgbus subscriptions are removed when loading a file
+    clear_selection_stats()
+    subscribe_selection_stats()
@@ -1,7 +1,9 @@
 import bpy
 from bpy.props import BoolProperty, EnumProperty
-from mathutils import Matrix, Vector, Euler
-from .. utils.math import get_loc_matrix, get_rot_matrix, get_sca_matrix
+from mathutils import Matrix
+import numpy as np
+from .. utils.math import decompose_matrices, compose_matrices, get_eulers_from_rotation_matrices, get_rotation_matrices_from_eulers
+from .. utils.mesh import get_coords
 
 
 # TODO: bone support? Make sure to activate. Make sure to have scene.tool_settings.lock_object_modes disabled
@@ -35,6 +37,7 @@ class Align(bpy.types.Operator):
     sca_y: BoolProperty(name="Y", default=True)
     sca_z: BoolProperty(name="Z", default=True)
 
+    evaluated: BoolProperty(name="Evaluated", description="Drop to floor based on the geometry including modifiers, instead of the base mesh", default=True)
 
     def draw(self, context):
         layout = self.layout
@@ -76,6 +79,12 @@ class Align(bpy.types.Operator):
             r.prop(self, "sca_y", toggle=True)
             r.prop(self, "sca_z", toggle=True)
 
+        if self.mode == "FLOOR":
+            row = column.split(factor=0.3)
+            row.label(text="Geometry")
+            r = row.row()
+            r.prop(self, "evaluated", toggle=True)
+
     @classmethod
     def poll(cls, context):
         return context.mode == "OBJECT" and context.selected_objects
@@ -98,183 +107,101 @@ class Align(bpy.types.Operator):
                 self.align_to_active(active, sel)
 
         elif self.mode == "FLOOR":
-            self.drop_to_floor(sel)
+            self.drop_to_floor(sel, context.evaluated_depsgraph_get())
 
 
         return {'FINISHED'}
 
     def align_to_origin(self, sel):
-        for obj in sel:
-            # get object matrix and decompose
-            omx = obj.matrix_world
-            oloc, orot, osca = omx.decompose()
-
-            # split components into x,y,z axis elements
-            olocx, olocy, olocz = oloc
-            orotx, oroty, orotz = orot.to_euler('XYZ')
-            oscax, oscay, oscaz = osca
-
-            # TRANSLATION
-
-            # if location is aligned, pick the axis elements based on the loc axis props
-            if self.location:
-                locx = 0 if self.loc_x else olocx
-                locy = 0 if self.loc_y else olocy
-                locz = 0 if self.loc_z else olocz
-
-                # re-assemble into translation matrix
-                loc = get_loc_matrix(Vector((locx, locy, locz)))
-
-            # otherwise, just use the object's location component
-            else:
-                loc = get_loc_matrix(oloc)
-
-
-            # ROTATION
-
-            rot = orot.to_matrix().to_4x4()
-
-
-            # SCALE
-
-            sca = get_sca_matrix(osca)
-
-
-            # re-combine components into world matrix
-            obj.matrix_world = loc @ rot @ sca
+        self.align_matrices(sel, loc=(0, 0, 0))
 
     def align_to_cursor(self, cursor, sel):
         cursor.rotation_mode = 'XYZ'
 
-        for obj in sel:
-            # get object matrix and decompose
-            omx = obj.matrix_world
-            oloc, orot, osca = omx.decompose()
-
-            # split components into x,y,z axis elements
-            olocx, olocy, olocz = oloc
-            orotx, oroty, orotz = orot.to_euler('XYZ')
-            oscax, oscay, oscaz = osca
-
-            # TRANSLATION
-
-            # if location is aligned, pick the axis elements based on the loc axis props
-            if self.location:
-                locx = cursor.location.x if self.loc_x else olocx
-                locy = cursor.location.y if self.loc_y else olocy
-                locz = cursor.location.z if self.loc_z else olocz
-
-                # re-assemble into translation matrix
-                loc = get_loc_matrix(Vector((locx, locy, locz)))
-
-            # otherwise, just use the object's location component
-            else:
-                loc = get_loc_matrix(oloc)
-
-
-            # ROTATION
-
-            # if rotation is aligned, pick the axis elements based on the rot axis props
-            if self.rotation:
-                rotx = cursor.rotation_euler.x if self.rot_x else orotx
-                roty = cursor.rotation_euler.y if self.rot_y else oroty
-                rotz = cursor.rotation_euler.z if self.rot_z else orotz
-
-                # re-assemble into rotation matrix
-                rot = get_rot_matrix(Euler((rotx, roty, rotz), 'XYZ'))
-
-            # otherwise, just use the object's rotation component
-            else:
-                rot = get_rot_matrix(orot)
-
-
-            # SCALE
-
-            sca = get_sca_matrix(osca)
-
-
-            # re-combine components into world matrix
-            obj.matrix_world = loc @ rot @ sca
+        self.align_matrices(sel, loc=cursor.location, rot=cursor.rotation_euler)
 
     def align_to_active(self, active, sel):
         # get target matrix and decompose
-        amx = active.matrix_world
-        aloc, arot, asca = amx.decompose()
-
-        # split components into x,y,z axis elements
-        alocx, alocy, alocz = aloc
-        arotx, aroty, arotz = arot.to_euler('XYZ')
-        ascax, ascay, ascaz = asca
+        aloc, arot, asca = decompose_matrices(np.array([active.matrix_world]))
 
-        for obj in sel:
-            # get object matrix and decompose
-            omx = obj.matrix_world
-            oloc, orot, osca = omx.decompose()
+        self.align_matrices(sel, loc=aloc[0], rot=get_eulers_from_rotation_matrices(arot)[0], sca=asca[0])
 
-            # split components into x,y,z axis elements
-            olocx, olocy, olocz = oloc
-            orotx, oroty, orotz = orot.to_euler('XYZ')
-            oscax, oscay, oscaz = osca
+    def align_matrices(self, sel, loc=None, rot=None, sca=None):
+        """
+        align the location, XYZ euler rotation and scale components of all objects at once, based on the per axis props
+        components, that aren't passed in or aren't aligned, are kept
+        """
 
-            # TRANSLATION
+        # nothing to align, like when only the active object is selected in ACTIVE mode
+        if not sel:
+            return
 
-            # if location is aligned, pick the axis elements based on the loc axis props
-            if self.location:
-                locx = alocx if self.loc_x else olocx
-                locy = alocy if self.loc_y else olocy
-                locz = alocz if self.loc_z else olocz
+        # get object matrices and decompose
+        locs, rots, scas = decompose_matrices(np.array([obj.matrix_world for obj in sel]))
 
-                # re-assemble into translation matrix
-                loc = get_loc_matrix(Vector((locx, locy, locz)))
+        # TRANSLATION
 
-            # otherwise, just use the object's location component
-            else:
-                loc = get_loc_matrix(oloc)
+        if loc is not None and self.location:
+            mask = [self.loc_x, self.loc_y, self.loc_z]
+            locs[:, mask] = np.array(loc)[mask]
 
+        # ROTATION
 
-            # ROTATION
+        if rot is not None and self.rotation:
+            mask = [self.rot_x, self.rot_y, self.rot_z]
 
-            # if rotation is aligned, pick the axis elements based on the rot axis props
-            if self.rotation:
-                rotx = arotx if self.rot_x else orotx
-                roty = aroty if self.rot_y else oroty
-                rotz = arotz if self.rot_z else orotz
+            eulers = get_eulers_from_rotation_matrices(rots)
+            eulers[:, mask] = np.array(rot)[mask]
 
-                # re-assemble into rotation matrix
-                rot = get_rot_matrix(Euler((rotx, roty, rotz), 'XYZ'))
+            rots = get_rotation_matrices_from_eulers(eulers)
 
-            # otherwise, just use the object's rotation component
-            else:
-                rot = get_rot_matrix(orot)
+        # SCALE
 
+        if sca is not None and self.scale:
+            mask = [self.sca_x, self.sca_y, self.sca_z]
+            scas[:, mask] = np.array(sca)[mask]
 
-            # SCALE
+        # re-combine components into world matrices
+        mxs = compose_matrices(locs, rots, scas)
 
-            # if scale is aligned, pick the axis elements based on the sca axis props
-            if self.scale:
-                scax = ascax if self.sca_x else oscax
-                scay = ascay if self.sca_y else oscay
-                scaz = ascaz if self.sca_z else oscaz
+        # setting an object's world matrix moves its children along, so set parents before their children
+        for idx in sorted(range(len(sel)), key=lambda idx: self.get_depth(sel[idx])):
+            sel[idx].matrix_world = Matrix(mxs[idx].tolist())
 
-                # re-assemble into scale matrix
-                sca = get_sca_matrix(Vector((scax, scay, scaz)))
+    def get_depth(self, obj):
+        depth = 0
 
-            # otherwise, just use the object's scale component
-            else:
-                sca = get_sca_matrix(osca)
+        while obj.parent:
+            obj = obj.parent
+            depth += 1
 
+        return depth
 
-            # re-combine components into world matrix
-            obj.matrix_world = loc @ rot @ sca
+    def drop_to_floor(self, selection, depsgraph):
+        # vert coordinates are read once per mesh, and only evaluated meshes of objects with modifiers are unique per object
+        coords = {}
 
-    def drop_to_floor(self, selection):
         for obj in selection:
             mx = obj.matrix_world
 
             if obj.type == "MESH":
-                minz = min((mx @ v.co)[2] for v in obj.data.vertices)
+                key = obj if self.evaluated and obj.modifiers else obj.data
+
+                if key not in coords:
+                    if key == obj:
+                        obj_eval = obj.evaluated_get(depsgraph)
+                        coords[key] = get_coords(obj_eval.to_mesh())
+                        obj_eval.to_mesh_clear()
+
+                    else:
+                        coords[key] = get_coords(obj.data)
+
+                if len(coords[key]):
+
+                    # only the z row of the world matrix is needed
+                    minz = (coords[key] @ np.array(mx)[2, :3]).min() + mx.translation.z
 
-                mx.translation.z -= minz
+                    mx.translation.z -= minz
 
             elif obj.type == "EMPTY":
                 mx.translation.z -= obj.location.z
@@ -1,9 +1,9 @@
 import bpy
 from bpy.props import BoolProperty
-import bmesh
-from mathutils import Vector, Quaternion
+from mathutils import Vector, Quaternion, Matrix
+import numpy as np
 from .. utils.registration import get_addon
-from .. utils.math import flatten_matrix, get_loc_matrix, get_rot_matrix, get_sca_matrix
+from .. utils.math import flatten_matrix, get_loc_matrix, get_rot_matrix, get_sca_matrix, decompose_matrices, compose_matrices
 
 
 # TODO: updare child parent inverse mx?
@@ -18,6 +18,8 @@ class Apply(bpy.types.Operator):
     scale: BoolProperty(name="Scale", default=True)
     rotation: BoolProperty(name="Rotation", default=False)
 
+    recursive: BoolProperty(name="Recursive", description="Apply the transformations to the entire hierarchies of the selected objects", default=False)
+
     def draw(self, context):
         layout = self.layout
 
@@ -27,6 +29,8 @@ class Apply(bpy.types.Operator):
         row.prop(self, "scale", toggle=True)
         row.prop(self, "rotation", toggle=True)
 
+        column.prop(self, "recursive", toggle=True)
+
     @classmethod
     def poll(cls, context):
         return context.mode == 'OBJECT' and context.selected_objects
@@ -38,19 +42,21 @@ class Apply(bpy.types.Operator):
             # only apply the scale to objects, that arent't parented themselves
             apply_objs = [obj for obj in context.selected_objects if not obj.parent]
 
-            for obj in apply_objs:
+            if self.recursive:
+                self.apply_recursive(apply_objs, decalmachine)
+                return {'FINISHED'}
 
-                # fetch children and their current world mx
-                children = [(child, child.matrix_world) for child in obj.children]
+            # fetch children and their current world mx, before any of the parents change
+            children = {obj: [(child, child.matrix_world.copy()) for child in obj.children] for obj in apply_objs}
 
-                mx = obj.matrix_world
-                loc, rot, sca = mx.decompose()
+            transforms = {}
+            data_groups = {}
 
-                # apply the current transformations on the mesh level
-                bm = bmesh.new()
-                bm.from_mesh(obj.data)
-                bm.normal_update()
-                bm.verts.ensure_lookup_table()
+            # objects without transformable data, like empties, keep their transformations
+            apply_objs = [obj for obj in apply_objs if self.has_transformable_data(obj)]
+
+            for obj in apply_objs:
+                loc, rot, sca = obj.matrix_world.decompose()
 
                 if self.rotation and self.scale:
                     bmmx = get_rot_matrix(rot) @ get_sca_matrix(sca)
@@ -59,38 +65,141 @@ class Apply(bpy.types.Operator):
                 elif self.scale:
                     bmmx = get_sca_matrix(sca)
 
-                bmesh.ops.transform(bm, matrix=bmmx, verts=bm.verts)
+                transforms[obj] = loc, rot, sca, bmmx
+                self.add_to_data_groups(data_groups, obj, bmmx)
 
-                bm.to_mesh(obj.data)
-                bm.clear()
+            # apply the current transformations on the data level
+            self.transform_data(data_groups)
 
-                # zero out the transformations on the object level
-                if self.rotation and self.scale:
-                    applymx = get_loc_matrix(loc) @ get_rot_matrix(Quaternion()) @ get_sca_matrix(Vector.Fill(3, 1))
-                elif self.rotation:
-                    applymx = get_loc_matrix(loc) @ get_rot_matrix(Quaternion()) @ get_sca_matrix(sca)
-                elif self.scale:
-                    applymx = get_loc_matrix(loc) @ get_rot_matrix(rot) @ get_sca_matrix(Vector.Fill(3, 1))
+            for obj, (loc, rot, sca, bmmx) in transforms.items():
+                self.apply_object(obj, loc, rot, sca, bmmx, children[obj], decalmachine)
+
+        return {'FINISHED'}
 
-                obj.matrix_world = applymx
+    def apply_recursive(self, apply_objs, decalmachine):
+        """
+        apply the transformations of the selected objects and all of their descendants in a single top-down pass
+        the data of each object is transformed by its world rotation and/or scale, and the new local matrices of all objects are calculated at once
+        """
 
+        # walk the hierarchies top-down, so parents always come before their children
+        objs = list(apply_objs)
+        seen = set(objs)
 
-                # adjust the bevel width values accordingly
-                if self.scale:
-                    mods = [mod for mod in obj.modifiers if mod.type == "BEVEL"]
+        for obj in objs:
+            for child in obj.children:
+                if child not in seen:
+                    objs.append(child)
+                    seen.add(child)
 
-                    for mod in mods:
-                        vwidth = get_sca_matrix(sca) @ Vector((0, 0, mod.width))
-                        mod.width = vwidth[2]
+        # nothing to apply, like when only parented objects are selected
+        if not objs:
+            return
 
+        index = {obj: idx for idx, obj in enumerate(objs)}
 
-                # reset the children to their original state again
-                for obj, mxw in children:
-                    obj.matrix_world = mxw
+        mxs = np.array([obj.matrix_world for obj in objs])
+        locs, rots, scas = decompose_matrices(mxs)
 
-                    # update decal backups's backup matrices as well, we can just reuse the bmesh mx here
-                    if decalmachine and obj.DM.decalbackup:
-                        backup = obj.DM.decalbackup
-                        backup.DM.backupmx = flatten_matrix(bmmx @ backup.DM.backupmx)
+        identity = np.broadcast_to(np.identity(3), rots.shape)
+        ones = np.ones_like(scas)
 
-        return {'FINISHED'}
+        # the transformations to apply on the data level, and the new world matrices
+        if self.rotation and self.scale:
+            datamxs = compose_matrices(np.zeros_like(locs), rots, scas)
+            worldmxs = compose_matrices(locs, identity, ones)
+        elif self.rotation:
+            datamxs = compose_matrices(np.zeros_like(locs), rots, ones)
+            worldmxs = compose_matrices(locs, identity, scas)
+        elif self.scale:
+            datamxs = compose_matrices(np.zeros_like(locs), identity, scas)
+            worldmxs = compose_matrices(locs, rots, ones)
+
+        # objects without transformable data, like empties, keep their transformations
+        has_data = np.array([self.has_transformable_data(obj) for obj in objs], dtype=bool)
+        worldmxs[~has_data] = mxs[~has_data]
+
+        data_groups = {}
+
+        for obj, datamx in zip(objs, datamxs):
+            if has_data[index[obj]]:
+                self.add_to_data_groups(data_groups, obj, Matrix(datamx.tolist()))
+
+        self.transform_data(data_groups)
+
+        # new local matrices, based on the new world matrices of the parents and the parent inverse matrices, roots just use their world matrices
+        parentmxs = np.array([worldmxs[index[obj.parent]] @ np.array(obj.matrix_parent_inverse) if obj.parent else np.identity(4) for obj in objs])
+        basismxs = np.linalg.inv(parentmxs) @ worldmxs
+
+        for obj, basismx, datamx, sca in zip(objs, basismxs, datamxs, scas):
+            obj.matrix_basis = Matrix(basismx.tolist())
+
+            if self.scale and has_data[index[obj]]:
+                self.adjust_bevel_widths(obj, Vector(sca))
+
+            # update decal backups's backup matrices as well, objects without data keep their transformations, so their backups stay as they are
+            if decalmachine and has_data[index[obj]]:
+                for child in obj.children:
+                    if child.DM.decalbackup:
+                        backup = child.DM.decalbackup
+                        backup.DM.backupmx = flatten_matrix(Matrix(datamx.tolist()) @ backup.DM.backupmx)
+
+    def has_transformable_data(self, obj):
+        return obj.data is not None and hasattr(obj.data, 'transform')
+
+    def add_to_data_groups(self, data_groups, obj, mx):
+        key = tuple(round(v, 6) for v in flatten_matrix(mx))
+        data_groups.setdefault(obj.data, {}).setdefault(key, (mx, []))[1].append(obj)
+
+    def transform_data(self, data_groups):
+        """
+        transform each unique data once, objects sharing data but not the transformation get their own copy
+        data_groups maps data to dicts of transformation keys and (matrix, objects) tuples
+        """
+
+        for data, groups in data_groups.items():
+            targets = [data] + [data.copy() for _ in range(len(groups) - 1)]
+
+            for target, (mx, objs) in zip(targets, groups.values()):
+
+                # shape keys have to be transformed as well, as the evaluated geometry comes from them, armatures and metaballs don't have any
+                if isinstance(target, (bpy.types.Mesh, bpy.types.Curve, bpy.types.Lattice)):
+                    target.transform(mx, shape_keys=True)
+                else:
+                    target.transform(mx)
+
+                for obj in objs:
+                    obj.data = target
+
+    def apply_object(self, obj, loc, rot, sca, bmmx, children, decalmachine):
+        # zero out the transformations on the object level
+        if self.rotation and self.scale:
+            applymx = get_loc_matrix(loc) @ get_rot_matrix(Quaternion()) @ get_sca_matrix(Vector.Fill(3, 1))
+        elif self.rotation:
+            applymx = get_loc_matrix(loc) @ get_rot_matrix(Quaternion()) @ get_sca_matrix(sca)
+        elif self.scale:
+            applymx = get_loc_matrix(loc) @ get_rot_matrix(rot) @ get_sca_matrix(Vector.Fill(3, 1))
+
+        obj.matrix_world = applymx
+
+
+        # adjust the bevel width values accordingly
+        if self.scale:
+            self.adjust_bevel_widths(obj, sca)
+
+
+        # reset the children to their original state again
+        for child, mxw in children:
+            child.matrix_world = mxw
+
+            # update decal backups's backup matrices as well, we can just reuse the data mx here
+            if decalmachine and child.DM.decalbackup:
+                backup = child.DM.decalbackup
+                backup.DM.backupmx = flatten_matrix(bmmx @ backup.DM.backupmx)
+
+    def adjust_bevel_widths(self, obj, sca):
+        mods = [mod for mod in obj.modifiers if mod.type == "BEVEL"]
+
+        for mod in mods:
+            vwidth = get_sca_matrix(sca) @ Vector((0, 0, mod.width))
+            mod.width = vwidth[2]
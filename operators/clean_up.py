@@ -1,7 +1,9 @@
 import bpy
 from bpy.props import BoolProperty, EnumProperty, FloatProperty
 import bmesh
-import math
+import numpy as np
+import time
+from .. utils.mesh import get_straight_2_edged_verts, read_array, get_loop_faces
 
 
 selecttypeitems = [("NON-MANIFOLD", "Non-Manifold", ""),
@@ -9,6 +11,10 @@ selecttypeitems = [("NON-MANIFOLD", "Non-Manifold", ""),
                    ("NGONS", "Ngons", "")]
 
 
+# meshes with more faces than this are selected via mesh arrays instead of bmesh
+array_select_face_count = 100000
+
+
 class CleanUp(bpy.types.Operator):
     bl_idname = "machin3.clean_up"
     bl_label = "MACHIN3: Clean Up"
@@ -31,9 +37,16 @@ class CleanUp(bpy.types.Operator):
 
     select: BoolProperty(name="Select", default=True)
     select_type: EnumProperty(name="Select", items=selecttypeitems, default="NON-MANIFOLD")
+    select_add: BoolProperty(name="Add to Selection", default=False)
 
     view_selected: BoolProperty(name="View Selected", default=False)
 
+    analyze: BoolProperty(name="Analyze", description="Report what each clean up stage would do and how long it takes, without changing the mesh", default=False)
+
+    # hidden
+    analysis = None
+    results = None
+
     def draw(self, context):
         layout = self.layout
         box = layout.box()
@@ -79,53 +92,199 @@ class CleanUp(bpy.types.Operator):
         row = col.row()
         row.active = self.select
         row.prop(self, "select_type", expand=True)
+        row.prop(self, "select_add", text="", icon="ADD")
+
+        box = layout.box()
+        col = box.column()
+
+        col.prop(self, "analyze")
+
+        if self.analyze and self.analysis:
+            for label, count in self.analysis['counts'].items():
+                row = col.split(factor=0.5)
+                row.label(text=label)
+                row.label(text=str(count))
+
+            col.separator()
+
+            for stage, t in self.analysis['timings'].items():
+                row = col.split(factor=0.5)
+                row.label(text=stage)
+                row.label(text="%.4fs" % (t))
+
+            if len(self.analysis['objects']) > 1:
+                col.separator()
+
+                for name, counts in self.analysis['objects']:
+                    row = col.split(factor=0.5)
+                    row.label(text=name)
+                    row.label(text=", ".join("%s: %d" % (label, count) for label, count in counts.items() if count))
+
+        elif not self.analyze and self.results and len(self.results) > 1:
+            for name, removed in self.results:
+                row = col.split(factor=0.5)
+                row.label(text=name)
+                row.label(text="-%d verts, -%d edges, -%d faces" % removed)
 
     @classmethod
     def poll(cls, context):
         return context.mode == "EDIT_MESH"
 
     def execute(self, context):
-        active = context.active_object
+        objects = context.objects_in_mode
 
-        bm = self.clean_up(active)
+        if self.analyze:
+            self.analysis = self.analyze_objects(objects)
+            self.report({'INFO'}, ", ".join("%s: %d" % (label, count) for label, count in self.analysis['counts'].items()))
 
-        if self.select:
-            self.select_geometry(bm)
+            return {'FINISHED'}
 
-        bmesh.update_edit_mesh(active.data)
+        self.results = self.clean_up(objects)
+
+        self.report({'INFO'}, "Cleaned up %d object%s, removed %d verts, %d edges, %d faces" % (len(self.results), "" if len(self.results) == 1 else "s", *[sum(r[i] for _, r in self.results) for i in range(3)]))
 
         if self.select and self.view_selected:
             bpy.ops.view3d.view_selected(use_all_regions=False)
 
         return {'FINISHED'}
 
-    def clean_up(self, active):
-        bm = bmesh.from_edit_mesh(active.data)
+    def clean_up(self, objects):
+        """
+        clean up all objects in edit mode, and return the number of removed verts, edges and faces per object
+        """
+
+        results = []
+        large = []
+
+        for obj in objects:
+            bm = bmesh.from_edit_mesh(obj.data)
+            bm.normal_update()
+            bm.verts.ensure_lookup_table()
+
+            counts = (len(bm.verts), len(bm.edges), len(bm.faces))
+
+            self.run_stages(bm)
+
+            if self.select:
+                if len(bm.faces) > array_select_face_count:
+                    large.append(obj.data)
+                else:
+                    self.select_geometry(bm)
+
+            bmesh.update_edit_mesh(obj.data)
+
+            results.append((obj.name, tuple(b - a for b, a in zip(counts, (len(bm.verts), len(bm.edges), len(bm.faces))))))
+
+        if large:
+            self.select_geometry_from_arrays(large)
+
+        return results
+
+    def analyze_objects(self, objects):
+        """
+        analyze all objects in edit mode, and aggregate the counts and timings
+        """
+
+        counts = {}
+        timings = {}
+        results = []
+
+        for obj in objects:
+            analysis = self.analyze_clean_up(obj)
+
+            for label, count in analysis['counts'].items():
+                counts[label] = counts.get(label, 0) + count
+
+            for name, t in analysis['timings'].items():
+                timings[name] = timings.get(name, 0) + t
+
+            results.append((obj.name, analysis['counts']))
+
+        return {'counts': counts, 'timings': timings, 'objects': results}
+
+    def analyze_clean_up(self, active):
+        """
+        run the clean up stages on a copy of the edit mesh, and return the number of affected elements as well as the time taken for each stage
+        """
+
+        editbm = bmesh.from_edit_mesh(active.data)
+
+        bm = editbm.copy()
         bm.normal_update()
         bm.verts.ensure_lookup_table()
 
+        counts = {}
+        timings = {}
+
+        def get_element_counts():
+            return len(bm.verts), len(bm.edges), len(bm.faces)
+
+        for name, stage in self.get_stages(bm):
+            before = get_element_counts()
+
+            start = time.time()
+            result = stage()
+            timings[name] = time.time() - start
+
+            removed = [b - a for b, a in zip(before, get_element_counts())]
+
+            if name == 'remove_doubles':
+                counts['Doubles'] = removed[0]
+
+            elif name == 'dissolve_degenerate':
+                counts['Degenerate'] = sum(removed)
+
+            elif name == 'delete_loose_geometry':
+                counts['Loose Verts'], counts['Loose Edges'], counts['Loose Faces'] = result
+
+            elif name == 'dissolve_2_edged_verts':
+                counts['2-Edged Verts'] = removed[0]
+
+        # what remains to be selected after the clean up
+        counts['Non-Manifold'] = len([e for e in bm.edges if not e.is_manifold])
+        counts['Tris'] = len([f for f in bm.faces if len(f.verts) == 3])
+        counts['Ngons'] = len([f for f in bm.faces if len(f.verts) > 4])
+
+        bm.free()
+
+        return {'counts': counts, 'timings': timings}
+
+    def get_stages(self, bm):
+        stages = []
+
         if self.remove_doubles:
-            bmesh.ops.remove_doubles(bm, verts=bm.verts, dist=self.distance)
+            stages.append(('remove_doubles', lambda: bmesh.ops.remove_doubles(bm, verts=bm.verts, dist=self.distance)))
 
         if self.dissolve_degenerate:
-            bmesh.ops.dissolve_degenerate(bm, edges=bm.edges, dist=self.distance)
+            stages.append(('dissolve_degenerate', lambda: bmesh.ops.dissolve_degenerate(bm, edges=bm.edges, dist=self.distance)))
 
         if self.delete_loose:
-            self.delete_loose_geometry(bm)
+            stages.append(('delete_loose_geometry', lambda: self.delete_loose_geometry(bm)))
 
         if self.dissolve_2_edged:
-            self.dissolve_2_edged_verts(bm)
+            stages.append(('dissolve_2_edged_verts', lambda: self.dissolve_2_edged_verts(bm)))
 
         if self.recalc_normals:
-            bmesh.ops.recalc_face_normals(bm, faces=bm.faces)
+            stages.append(('recalc_face_normals', lambda: self.recalc_face_normals(bm)))
+
+        return stages
 
-            if self.flip_normals:
-                for f in bm.faces:
-                    f.normal_flip()
+    def run_stages(self, bm):
+        for _, stage in self.get_stages(bm):
+            stage()
 
-        return bm
+    def recalc_face_normals(self, bm):
+        bmesh.ops.recalc_face_normals(bm, faces=bm.faces)
+
+        if self.flip_normals:
+            for f in bm.faces:
+                f.normal_flip()
 
     def delete_loose_geometry(self, bm):
+        loose_verts = []
+        loose_edges = []
+        loose_faces = []
+
         if self.delete_loose_verts:
             loose_verts = [v for v in bm.verts if not v.link_edges]
             bmesh.ops.delete(bm, geom=loose_verts, context="VERTS")
@@ -138,30 +297,19 @@ class CleanUp(bpy.types.Operator):
             loose_faces = [f for f in bm.faces if all([not e.is_manifold for e in f.edges])]
             bmesh.ops.delete(bm, geom=loose_faces, context="FACES")
 
-    def dissolve_2_edged_verts(self, bm):
-        all_2_edged_verts = [v for v in bm.verts if len(v.link_edges) == 2]
-
-        straight_edged = []
+        return len(loose_verts), len(loose_edges), len(loose_faces)
 
-        for v in all_2_edged_verts:
-            e1 = v.link_edges[0]
-            e2 = v.link_edges[1]
-
-            vector1 = e1.other_vert(v).co - v.co
-            vector2 = e2.other_vert(v).co - v.co
-
-            angle = math.degrees(vector1.angle(vector2))
-
-            if self.angle_threshold + 1 <= angle <= 181:
-                straight_edged.append(v)
+    def dissolve_2_edged_verts(self, bm):
+        straight_edged = get_straight_2_edged_verts(bm.verts, min_angle=self.angle_threshold + 1)
 
         bmesh.ops.dissolve_verts(bm, verts=straight_edged)
 
     def select_geometry(self, bm):
-        for f in bm.faces:
-            f.select = False
+        if not self.select_add:
+            for f in bm.faces:
+                f.select = False
 
-        bm.select_flush(False)
+            bm.select_flush(False)
 
         if self.select_type == "NON-MANIFOLD":
             edges = [e for e in bm.edges if not e.is_manifold]
@@ -180,3 +328,55 @@ class CleanUp(bpy.types.Operator):
 
             for f in faces:
                 f.select = True
+
+    def select_geometry_from_arrays(self, meshes):
+        """
+        select the non-manifold edges, tris or ngons of large meshes by building the selection masks from mesh arrays in one go
+        the edit meshes are written to and read back from the mesh data by toggling object mode once for all objects
+        """
+
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+        for mesh in meshes:
+            if self.select_add:
+                vert_select = read_array(mesh.vertices, 'select', bool)
+                edge_select = read_array(mesh.edges, 'select', bool)
+                face_select = read_array(mesh.polygons, 'select', bool)
+            else:
+                vert_select = np.zeros(len(mesh.vertices), dtype=bool)
+                edge_select = np.zeros(len(mesh.edges), dtype=bool)
+                face_select = np.zeros(len(mesh.polygons), dtype=bool)
+
+            # hidden elements can't be selected, just like in bmesh
+            vert_hide = read_array(mesh.vertices, 'hide', bool)
+            edge_hide = read_array(mesh.edges, 'hide', bool)
+            face_hide = read_array(mesh.polygons, 'hide', bool)
+
+            loop_edges = read_array(mesh.loops, 'edge_index', np.int32)
+
+            if self.select_type == "NON-MANIFOLD":
+                edge_verts = read_array(mesh.edges, 'vertices', np.int32, 2).reshape(-1, 2)
+
+                # manifold edges are used by exactly 2 faces
+                edge_mask = (np.bincount(loop_edges, minlength=len(mesh.edges)) != 2) & ~edge_hide
+
+                edge_select |= edge_mask
+                vert_select[edge_verts[edge_mask].ravel()] = True
+
+            else:
+                loop_start = read_array(mesh.polygons, 'loop_start', np.int32)
+                loop_total = read_array(mesh.polygons, 'loop_total', np.int32)
+                loop_verts = read_array(mesh.loops, 'vertex_index', np.int32)
+
+                face_mask = (loop_total == 3 if self.select_type == "TRIS" else loop_total > 4) & ~face_hide
+                loop_mask = face_mask[get_loop_faces(loop_start, loop_total)]
+
+                face_select |= face_mask
+                edge_select[loop_edges[loop_mask]] = True
+                vert_select[loop_verts[loop_mask]] = True
+
+            mesh.vertices.foreach_set('select', vert_select & ~vert_hide)
+            mesh.edges.foreach_set('select', edge_select & ~edge_hide)
+            mesh.polygons.foreach_set('select', face_select & ~face_hide)
+
+        bpy.ops.object.mode_set(mode='EDIT')
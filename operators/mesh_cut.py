@@ -1,43 +1,60 @@
 import bpy
 import bmesh
-from math import degrees
-from .. utils.mesh import unhide_deselect, join
+import numpy as np
+from .. utils.mesh import unhide, unhide_deselect, join, get_straight_2_edged_verts, get_intersecting_faces, hide_faces, read_array
 from .. utils.object import flatten
 
 
 class MeshCut(bpy.types.Operator):
     bl_idname = "machin3.mesh_cut"
     bl_label = "MACHIN3: Mesh Cut"
-    bl_description = "Knife Intersect a mesh, using another object.\nALT: flatten target object's modifier stack\nSHIFT: Mark Seam"
+    bl_description = "Knife Intersect a mesh, using one or more other objects.\nALT: flatten target object's modifier stack\nSHIFT: Mark Seam"
     bl_options = {'REGISTER', 'UNDO'}
 
     @classmethod
     def poll(cls, context):
-        return context.mode == 'OBJECT' and len(context.selected_objects) == 2 and context.active_object and context.active_object in context.selected_objects and all(obj.type == 'MESH' for obj in context.selected_objects)
+        return context.mode == 'OBJECT' and len(context.selected_objects) >= 2 and context.active_object and context.active_object in context.selected_objects and all(obj.type == 'MESH' for obj in context.selected_objects)
 
     def invoke(self, context, event):
         target = context.active_object
-        cutter = [obj for obj in context.selected_objects if obj != target][0]
+        cutters = [obj for obj in context.selected_objects if obj != target]
 
-        # unhide both
+        # flatten removes the old mesh, so cutters sharing a mesh with the target or each other, get their own copy first
+        meshes = {target.data}
+
+        for cutter in cutters:
+            if cutter.data in meshes:
+                cutter.data = cutter.data.copy()
+
+            meshes.add(cutter.data)
+
+        # unhide all
         unhide_deselect(target.data)
-        unhide_deselect(cutter.data)
+
+        for cutter in cutters:
+            unhide_deselect(cutter.data)
 
         # get depsgraph
         dg = context.evaluated_depsgraph_get()
 
-        # flatten the cutter
-        flatten(cutter, dg)
+        # flatten the cutters
+        for cutter in cutters:
+            flatten(cutter, dg)
 
         # flatten the target
         if event.alt:
             flatten(target, dg)
 
         # clear cutter materials
-        cutter.data.materials.clear()
+        for cutter in cutters:
+            cutter.data.materials.clear()
+
+        # join target and all cutters in one go, each cutter's faces are tagged with its index + 1
+        join(target, cutters, select=range(1, len(cutters) + 1))
 
-        # join target and cutter
-        join(target, [cutter], select=[1])
+        # hide the target faces, that can't be intersected by any of the cutters, so the intersection only runs on the overlapping parts
+        tags = read_array(target.data.polygon_layers_int[0].data, 'value', np.int32)
+        hide_faces(target.data, (tags == 0) & ~get_intersecting_faces(target.data))
 
         # knife intersect
         bpy.ops.object.mode_set(mode='EDIT')
@@ -47,7 +64,9 @@ class MeshCut(bpy.types.Operator):
             bpy.ops.mesh.intersect(separate_mode='CUT')
         bpy.ops.object.mode_set(mode='OBJECT')
 
-        # remove cutter
+        unhide(target.data)
+
+        # remove cutters
         bm = bmesh.new()
         bm.from_mesh(target.data)
         bm.normal_update()
@@ -76,20 +95,7 @@ class MeshCut(bpy.types.Operator):
             bmesh.ops.remove_doubles(bm, verts=list({v for e in non_manifold for v in e.verts}), dist=0.0001)
 
             # fetch the still valid verts and collect the straight 2-edged ones
-            straight_edged = []
-
-            for v in verts:
-                if v.is_valid and len(v.link_edges) == 2:
-                    e1 = v.link_edges[0]
-                    e2 = v.link_edges[1]
-
-                    vector1 = e1.other_vert(v).co - v.co
-                    vector2 = e2.other_vert(v).co - v.co
-
-                    angle = degrees(vector1.angle(vector2))
-
-                    if 179 <= angle <= 181:
-                        straight_edged.append(v)
+            straight_edged = get_straight_2_edged_verts([v for v in verts if v.is_valid], min_angle=179)
 
             # dissolve them
             bmesh.ops.dissolve_verts(bm, verts=straight_edged)
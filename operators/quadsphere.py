@@ -1,7 +1,9 @@
 import bpy
 from bpy.props import IntProperty, BoolProperty
-from bpy_extras.object_utils import AddObjectHelper
+import bmesh
 from math import radians
+from mathutils import Matrix
+from .. utils.mesh import get_quadsphere_data, create_mesh_from_quads
 
 
 class QuadSphere(bpy.types.Operator):
@@ -30,30 +32,57 @@ class QuadSphere(bpy.types.Operator):
         return context.mode in ['OBJECT', 'EDIT_MESH']
 
     def execute(self, context):
-        bpy.ops.mesh.primitive_cube_add(align='CURSOR' if self.align_rotation else 'WORLD')
+        coords, faces = get_quadsphere_data(self.subdivisions)
+
+        mesh = create_mesh_from_quads("Quadsphere", coords, faces)
 
         if self.shade_smooth:
-            bpy.ops.object.shade_smooth()
+            mesh.polygons.foreach_set('use_smooth', [True] * len(mesh.polygons))
 
-        mode = bpy.context.mode
+        # place it at the cursor, optionally aligned to its rotation
+        cursor = context.scene.cursor
+        mx = cursor.matrix if self.align_rotation else Matrix.Translation(cursor.location)
 
-        if mode == 'OBJECT':
-            bpy.ops.object.mode_set(mode='EDIT')
+        if context.mode == 'OBJECT':
+            quadsphere = bpy.data.objects.new("Quadsphere", mesh)
+            context.collection.objects.link(quadsphere)
 
-        for sub in range(self.subdivisions):
-            bpy.ops.mesh.subdivide(number_cuts=1, smoothness=1)
-            bpy.ops.transform.tosphere(value=1)
+            quadsphere.matrix_world = mx
 
-        if mode == 'OBJECT':
-            bpy.ops.object.mode_set(mode='OBJECT')
+            for obj in context.selected_objects:
+                obj.select_set(False)
 
-        quadsphere = context.active_object
-        quadsphere.data.auto_smooth_angle = radians(60)
+            quadsphere.select_set(True)
+            context.view_layer.objects.active = quadsphere
+
+        # in edit mode, add the geometry to the edit mesh and select it
+        else:
+            quadsphere = context.active_object
+
+            bm = bmesh.from_edit_mesh(quadsphere.data)
+
+            for v in bm.verts:
+                v.select_set(False)
+
+            bm.select_flush(False)
+
+            vert_count = len(bm.verts)
 
-        # clear uvs
-        mesh = quadsphere.data
+            bm.from_mesh(mesh)
+            bm.verts.ensure_lookup_table()
 
-        while mesh.uv_layers:
-            mesh.uv_layers.remove(mesh.uv_layers[0])
+            verts = bm.verts[vert_count:]
+            bmesh.ops.transform(bm, matrix=quadsphere.matrix_world.inverted_safe() @ mx, verts=verts)
+
+            for v in verts:
+                v.select_set(True)
+
+            bm.select_flush(True)
+
+            bmesh.update_edit_mesh(quadsphere.data)
+
+            bpy.data.meshes.remove(mesh, do_unlink=True)
+
+        quadsphere.data.auto_smooth_angle = radians(60)
 
         return {'FINISHED'}
@@ -1,6 +1,8 @@
 import bpy
-from bpy.props import EnumProperty
-from mathutils import Vector
+from bpy.props import EnumProperty, BoolProperty
+import numpy as np
+from .. utils.bounds import get_object_bounds
+from .. utils.mesh import read_array
 
 
 axis_items = [("0", "X", ""),
@@ -15,6 +17,7 @@ class SelectCenterObjects(bpy.types.Operator):
     bl_options = {'REGISTER', 'UNDO'}
 
     axis: EnumProperty(name="Axis", items=axis_items, default="0")
+    exact: BoolProperty(name="Exact", description="Test the evaluated mesh vertices instead of the bounding boxes", default=False)
 
     def draw(self, context):
         layout = self.layout
@@ -23,6 +26,7 @@ class SelectCenterObjects(bpy.types.Operator):
 
         row = column.row()
         row.prop(self, "axis", expand=True)
+        row.prop(self, "exact", toggle=True)
 
     @classmethod
     def poll(cls, context):
@@ -35,12 +39,41 @@ class SelectCenterObjects(bpy.types.Operator):
 
             bpy.ops.object.select_all(action='DESELECT')
 
-            for obj in visible:
-                mx = obj.matrix_world
+            mins, maxs = get_object_bounds(visible, context.scene)
 
-                coords = [(mx @ Vector(co))[int(self.axis)] for co in obj.bound_box]
+            axis = int(self.axis)
+            center = (mins[:, axis] < 0) & (maxs[:, axis] > 0)
 
-                if min(coords) < 0 and max(coords) > 0:
+            # objects, whose bounding box is on one side of the axis, can't have verts on both sides, so only the remaining ones are tested exactly
+            if self.exact:
+                dg = context.evaluated_depsgraph_get()
+
+                for idx in np.nonzero(center)[0]:
+                    center[idx] = self.has_verts_on_both_sides(visible[idx], dg, axis)
+
+            for obj, is_center in zip(visible, center):
+                if is_center:
                     obj.select_set(True)
 
         return {'FINISHED'}
+
+    def has_verts_on_both_sides(self, obj, depsgraph, axis):
+        """
+        test the world space coordinates of the evaluated mesh along the axis, the mesh is released right away, so only a single object's coordinates are held at a time
+        """
+
+        obj_eval = obj.evaluated_get(depsgraph)
+        mesh = obj_eval.to_mesh()
+
+        coords = read_array(mesh.vertices, 'co', np.float32, 3).reshape(-1, 3)
+
+        obj_eval.to_mesh_clear()
+
+        if not len(coords):
+            return False
+
+        # only the axis row of the world matrix is needed
+        mx = np.array(obj.matrix_world)
+        values = coords @ mx[axis, :3] + mx[axis, 3]
+
+        return values.min() < 0 < values.max()
@@ -111,23 +111,46 @@ class SmartEdge(bpy.types.Operator):
         verify the selection and star connect if it fits, otherwise return False
         '''
 
-        def star_connect(bm, last, verts):
-            verts.remove(last)
+        def star_connect(bm, common, last, verts):
+            '''
+            split the common face from the last vert to each of the others, walking them in face order, so each spoke splits the face holding the remaining ones
+            '''
 
-            for v in verts:
-                bmesh.ops.connect_verts(bm, verts=[last, v])
+            # start the walk right after the last vert
+            face_verts = [l.vert for l in common.loops]
+            idx = face_verts.index(last)
+            spokes = [v for v in face_verts[idx + 1:] + face_verts[:idx] if v in verts]
+
+            face = common
+
+            for v in spokes:
+                # neighbours in the face are connected already
+                if bm.edges.get([last, v]) in face.edges:
+                    continue
+
+                new, _ = bmesh.utils.face_split(face, last, v)
+
+                # the remaining spokes are on the side of the face, that continues past v
+                face = new if spokes[-1] in new.verts else face
 
         verts = [v for v in bm.verts if v.select]
         history = list(bm.select_history)
         last = history[-1] if history else None
 
         # check if there's a common face shared by all the verts, a good indicator for star connect
-        faces = [f for v in verts for f in v.link_faces]
-
         common = None
-        for f in faces:
-            if all([v in f.verts for v in verts]):
-                common = f
+
+        if verts:
+            faces = set(verts[0].link_faces)
+
+            for v in verts[1:]:
+                faces.intersection_update(v.link_faces)
+
+                if not faces:
+                    break
+
+            if faces:
+                common = faces.pop()
 
         # with only two verts, only a path connect makes sence, unless the verts are connected already, then nothing should be done, it works even without a history in the case of just 2
         if len(verts) == 2 and not bm.edges.get([verts[0], verts[1]]):
@@ -144,7 +167,7 @@ class SmartEdge(bpy.types.Operator):
 
                 # without a complete history the only option is star connect, but that works only with a common face
                 elif common:
-                    star_connect(bm, last, verts)
+                    star_connect(bm, common, last, set(verts))
 
 
         # with more than 3 verts, the base assumption is, you want to make a star connect, complete history or not
@@ -154,7 +177,7 @@ class SmartEdge(bpy.types.Operator):
 
                 # for star connect, you need to have a common face
                 if common:
-                    star_connect(bm, last, verts)
+                    star_connect(bm, common, last, set(verts))
 
 
                 # without a common face, the only option is path connect but that needs a complete history
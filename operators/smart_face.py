@@ -1,6 +1,9 @@
 import bpy
 from bpy.props import BoolProperty
 import bmesh
+from collections import defaultdict
+import numpy as np
+from .. utils.mesh import get_bm_counts, keep_boundary_tree, get_closest_boundary_vert, create_mesh_from_faces, read_array
 
 
 class SmartFace(bpy.types.Operator):
@@ -51,29 +54,77 @@ class SmartFace(bpy.types.Operator):
 
         # face mode - duplicate and separate selection
         elif self.mode[2]:
-            faces = [f for f in bm.faces if f.select]
+            if active.data.total_face_sel:
+                bpy.ops.object.mode_set(mode='OBJECT')
 
-            if faces:
-                bpy.ops.mesh.duplicate()
-                bpy.ops.mesh.separate(type='SELECTED')
+                obj = self.separate_faces(active)
 
-                bpy.ops.object.mode_set(mode='OBJECT')
+                active.select_set(False)
+                obj.select_set(True)
+                context.view_layer.objects.active = obj
+                bpy.ops.object.mode_set(mode='EDIT')
 
-                objs = [obj for obj in context.selected_objects if obj != active]
+        return {'FINISHED'}
 
-                if objs:
-                    obj = objs[0]
+    def separate_faces(self, active):
+        """
+        copy the selected faces into a new object, directly from the mesh arrays, instead of duplicating and separating them
+        """
 
-                    active.select_set(False)
-                    obj.select_set(True)
-                    context.view_layer.objects.active = obj
-                    bpy.ops.object.mode_set(mode='EDIT')
+        mesh = active.data
+        faces = read_array(mesh.polygons, 'select', bool)
 
-        return {'FINISHED'}
+        newmesh, verts = create_mesh_from_faces(mesh.name, mesh, faces)
+
+        # select everything, like the separated geometry would be
+        for collection in [newmesh.vertices, newmesh.edges, newmesh.polygons]:
+            collection.foreach_set('select', np.ones(len(collection), dtype=bool))
+
+        # the copy carries over modifiers, vertex groups and the parenting, the shape keys belong to the mesh though
+        obj = active.copy()
+        obj.data = newmesh
+
+        for col in active.users_collection:
+            col.objects.link(obj)
+
+        # vertex group weights are stored per vert, so batch them up by group and weight
+        if active.vertex_groups:
+            weights = defaultdict(list)
+
+            for idx, vidx in enumerate(verts):
+                for g in mesh.vertices[vidx].groups:
+                    weights[(g.group, g.weight)].append(idx)
+
+            for (group, weight), indices in weights.items():
+                obj.vertex_groups[group].add(indices, weight, 'REPLACE')
+
+        # shape keys are stored per vert as well, so copy the coordinates of the copied verts for each key block
+        if mesh.shape_keys:
+            for kb in mesh.shape_keys.key_blocks:
+                newkb = obj.shape_key_add(name=kb.name, from_mix=False)
+                newkb.data.foreach_set('co', read_array(kb.data, 'co', np.float32, 3).reshape(-1, 3)[verts].reshape(-1))
+
+                newkb.interpolation = kb.interpolation
+                newkb.vertex_group = kb.vertex_group
+                newkb.slider_min = kb.slider_min
+                newkb.slider_max = kb.slider_max
+                newkb.value = kb.value
+                newkb.mute = kb.mute
+
+            # relative keys can only be set, once all key blocks exist
+            for kb in mesh.shape_keys.key_blocks:
+                newmesh.shape_keys.key_blocks[kb.name].relative_key = newmesh.shape_keys.key_blocks[kb.relative_key.name]
+
+            newmesh.shape_keys.use_relative = mesh.shape_keys.use_relative
+
+        return obj
 
     def f3(self, active, bm):
         verts = self.verts
 
+        # the topology before adding any geometry, used to keep the cached boundary kd tree across repeated F3 presses
+        counts = get_bm_counts(bm)
+
         if len(verts) == 1:
             vs = verts[0]
 
@@ -103,19 +154,18 @@ class SmartFace(bpy.types.Operator):
                 # recalc the face normal
                 bmesh.ops.recalc_face_normals(bm, faces=[f])
 
+                keep_boundary_tree(active.data, bm, counts)
+
                 # automatically merge the newly created vert to the closest non manifold vert if it's closer than the 2 other verts are
                 if self.automerge:
-                    nonmanifoldverts = [v for v in bm.verts if any([not e.is_manifold for e in v.link_edges]) and v not in [vs, v_new, v1_other, v2_other]]
+                    threshold = min([(v_new.co - v.co).length * 0.5 for v in [v1_other, v2_other]])
 
-                    if nonmanifoldverts:
-                        distance = min([((v_new.co - v.co).length, v) for v in nonmanifoldverts], key=lambda x: x[0])
-                        threshold = min([(v_new.co - v.co).length * 0.5 for v in [v1_other, v2_other]])
+                    v_closest = get_closest_boundary_vert(active.data, bm, v_new.co, threshold, exclude=[vs, v_new, v1_other, v2_other])
 
-                        if distance[0] < threshold:
-                            v_closest = distance[1]
+                    if v_closest:
 
-                            # merge new to closest, NOTE: in this verts order, the v_new vert stays alive, which is perfect
-                            bmesh.ops.pointmerge(bm, verts=[v_new, v_closest], merge_co=v_closest.co)
+                        # merge new to closest, NOTE: in this verts order, the v_new vert stays alive, which is perfect
+                        bmesh.ops.pointmerge(bm, verts=[v_new, v_closest], merge_co=v_closest.co)
 
 
                 # if any of the other two verts has 4 edges, at least one of them non-manifold, select it. first come first serve.
@@ -177,6 +227,8 @@ class SmartFace(bpy.types.Operator):
                 # recalc the face normal
                 bmesh.ops.recalc_face_normals(bm, faces=[f])
 
+                keep_boundary_tree(active.data, bm, counts)
+
                 v1.select = False
                 v2.select = False
 
@@ -1,11 +1,13 @@
 import bpy
 import bmesh
-from bpy.props import EnumProperty, BoolProperty
+from bpy.props import EnumProperty, BoolProperty, IntProperty
 import gpu
 from gpu_extras.batch import batch_for_shader
 import bgl
-from .. utils.graph import get_shortest_path
+import numpy as np
+from .. utils.graph import get_shortest_paths
 from .. utils.ui import wrap_mouse
+from .. utils.selection import get_selection_stats
 
 
 modeitems = [("MERGE", "Merge", ""),
@@ -18,6 +20,10 @@ mergetypeitems = [("LAST", "Last", ""),
 pathtypeitems = [("TOPO", "Topo", ""),
                  ("LENGTH", "Length", "")]
 
+escalationitems = [("WIDEN", "Widen", ""),
+                   ("FULL", "Full Mesh", ""),
+                   ("NONE", "None", "")]
+
 
 class SmartVert(bpy.types.Operator):
     bl_idname = "machin3.smart_vert"
@@ -28,6 +34,10 @@ class SmartVert(bpy.types.Operator):
     mergetype: EnumProperty(name="Merge Type", items=mergetypeitems, default="LAST")
     pathtype: EnumProperty(name="Path Type", items=pathtypeitems, default="TOPO")
 
+    # with a radius, paths are only searched in the k-ring around the picked verts, and the escalation determines what happens if no path is found there
+    pathradius: IntProperty(name="Path Region Radius", default=0, min=0)
+    pathescalation: EnumProperty(name="Path Region Escalation", items=escalationitems, default="WIDEN")
+
     slideoverride: BoolProperty(name="Slide Override", default=False)
 
     # hidden
@@ -36,8 +46,7 @@ class SmartVert(bpy.types.Operator):
     @classmethod
     def poll(cls, context):
         if context.mode == 'EDIT_MESH' and tuple(context.scene.tool_settings.mesh_select_mode) == (True, False, False):
-            bm = bmesh.from_edit_mesh(context.active_object.data)
-            return [v for v in bm.verts if v.select]
+            return get_selection_stats(context.active_object)['verts'] > 0
 
     def draw(self, context):
         layout = self.layout
@@ -66,6 +75,14 @@ class SmartVert(bpy.types.Operator):
                     r = row.row()
                     r.prop(self, "pathtype", expand=True)
 
+                    row = column.split(factor=0.3)
+                    row.label(text="Region")
+                    r = row.row()
+                    r.prop(self, "pathradius", text="Radius")
+
+                    if self.pathradius:
+                        r.prop(self, "pathescalation", text="")
+
     def draw_VIEW3D(self, args):
         shader = gpu.shader.from_builtin('3D_UNIFORM_COLOR')
         shader.bind()
@@ -118,35 +135,37 @@ class SmartVert(bpy.types.Operator):
         # CANCEL
 
         elif event.type in {'RIGHTMOUSE', 'ESC'}:
-            self.cancel_modal()
+            self.cancel_modal(context)
             return {'CANCELLED'}
 
         self.last_mouse_x = self.mouse_x
 
         return {'RUNNING_MODAL'}
 
-    def cancel_modal(self):
+    def cancel_modal(self, context):
         bpy.types.SpaceView3D.draw_handler_remove(self.VIEW3D, 'WINDOW')
 
-        bpy.ops.object.mode_set(mode='OBJECT')
-        self.initbm.to_mesh(self.active.data)
-        bpy.ops.object.mode_set(mode='EDIT')
+        # restore the initial vert positions
+        self.slide(context, 1)
 
     def invoke(self, context, event):
         # SLIDE EXTEND
         if self.slideoverride:
             bm = bmesh.from_edit_mesh(context.active_object.data)
+            bm.verts.index_update()
+
             verts = [v for v in bm.verts if v.select]
 
             if len(verts) > 1:
                 self.active = context.active_object
 
-                # make sure the current edit mode state is saved to obj.data
-                self.active.update_from_editmode()
+                history = list(bm.select_history)
+                last = history[-1]
 
-                # save this initial mesh state, this will be used when canceling the modal and to reset it for each mousemove event
-                self.initbm = bmesh.new()
-                self.initbm.from_mesh(self.active.data)
+                # save the initial positions of the slide verts, these will be used when canceling the modal and to reset them for each mousemove event
+                self.last_co = np.array(last.co)
+                self.vert_ids = [v.index for v in verts if v != last]
+                self.init_coords = np.array([v.co for v in verts if v != last]).reshape(-1, 3)
 
                 # mouse positions
                 self.mouse_x = self.last_mouse_x = event.mouse_region_x
@@ -201,7 +220,7 @@ class SmartVert(bpy.types.Operator):
                     history = self.validate_history(active, bm)
 
                     if history:
-                        path1, path2 = self.get_paths(bm, history, topo)
+                        path1, path2 = self.get_paths(active, bm, history, topo)
 
                         self.weld(active, bm, path1, path2)
                         return
@@ -217,20 +236,22 @@ class SmartVert(bpy.types.Operator):
                 history = self.validate_history(active, bm)
 
                 if history:
-                    path1, path2 = self.get_paths(bm, history, topo)
+                    path1, path2 = self.get_paths(active, bm, history, topo)
 
                     self.connect(active, bm, path1, path2)
                     return
 
             self.wrongselection = True
 
-    def get_paths(self, bm, history, topo):
+    def get_paths(self, active, bm, history, topo):
         pair1 = history[0:2]
         pair2 = history[2:4]
         pair2.reverse()
 
-        path1 = get_shortest_path(bm, *pair1, topo=topo, select=True)
-        path2 = get_shortest_path(bm, *pair2, topo=topo, select=True)
+        # the path graph is built from the mesh arrays, so make sure they are in sync with the edit mesh
+        active.update_from_editmode()
+
+        path1, path2 = get_shortest_paths(active.data, bm, [pair1, pair2], topo=topo, select=True, radius=self.pathradius, escalation=self.pathescalation)
 
         return path1, path2
 
@@ -263,29 +284,24 @@ class SmartVert(bpy.types.Operator):
         bmesh.update_edit_mesh(active.data)
 
     def slide(self, context, distance):
-        mx = self.active.matrix_world
-
-        bpy.ops.object.mode_set(mode='OBJECT')
+        """
+        move the slide verts in place on the edit mesh, based on their initial positions, the topology is never changed
+        """
 
-        bm = self.initbm.copy()
-
-        history = list(bm.select_history)
+        mx = np.array(self.active.matrix_world)
 
-        last = history[-1]
-        verts = [v for v in bm.verts if v.select and v != last]
-
-        self.coords = []
-        self.edge_indices = []
-
-        self.coords.append(mx @ last.co)
+        bm = bmesh.from_edit_mesh(self.active.data)
+        bm.verts.ensure_lookup_table()
 
-        for idx, v in enumerate(verts):
-            v.co = last.co + (v.co - last.co) * distance
+        coords = self.last_co + (self.init_coords - self.last_co) * distance
 
-            self.coords.append(mx @ v.co)
-            self.edge_indices.append((0, idx + 1))
+        for idx, co in zip(self.vert_ids, coords.tolist()):
+            bm.verts[idx].co = co
 
+        bmesh.update_edit_mesh(self.active.data, loop_triangles=True, destructive=False)
 
-        bm.to_mesh(self.active.data)
+        # world space coords for drawing, the last vert first
+        world = np.vstack((self.last_co, coords)) @ mx[:3, :3].T + mx[:3, 3]
 
-        bpy.ops.object.mode_set(mode='EDIT')
+        self.coords = world.astype(np.float32).tolist()
+        self.edge_indices = [(0, idx + 1) for idx in range(len(self.vert_ids))]
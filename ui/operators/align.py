@@ -4,7 +4,7 @@ import bmesh
 from mathutils import Vector, Matrix, geometry
 from ... utils.math import get_center_between_verts, create_rotation_difference_matrix_from_quat, get_loc_matrix, create_selection_bbox, get_right_and_up_axes
 from ... items import axis_items, align_type_items, align_axis_mapping_dict, align_direction_items
-from ... utils.selection import get_selected_vert_sequences
+from ... utils.selection import get_selected_vert_sequences, get_selection_stats
 
 
 class AlignEditMesh(bpy.types.Operator):
@@ -23,9 +23,7 @@ class AlignEditMesh(bpy.types.Operator):
     @classmethod
     def poll(cls, context):
         if context.mode == "EDIT_MESH":
-            active = context.active_object
-            bm = bmesh.from_edit_mesh(active.data)
-            return [v for v in bm.verts if v.select]
+            return get_selection_stats(context.active_object)['verts'] > 0
 
     def invoke(self, context, event):
         self.local = not event.alt
@@ -130,9 +128,7 @@ class CenterEditMesh(bpy.types.Operator):
     @classmethod
     def poll(cls, context):
         if context.mode == "EDIT_MESH":
-            active = context.active_object
-            bm = bmesh.from_edit_mesh(active.data)
-            return [v for v in bm.verts if v.select]
+            return get_selection_stats(context.active_object)['verts'] > 0
 
     def invoke(self, context, event):
         self.local = not event.alt
@@ -335,8 +331,8 @@ class Straighten(bpy.types.Operator):
     @classmethod
     def poll(cls, context):
         if context.mode == 'EDIT_MESH':
-            bm = bmesh.from_edit_mesh(context.active_object.data)
-            return len([v for v in bm.verts if v.select]) > 2 and not [f for f in bm.faces if f.select]
+            stats = get_selection_stats(context.active_object)
+            return stats['verts'] > 2 and not stats['has_faces']
 
     def execute(self, context):
         active = context.active_object
@@ -0,0 +1,129 @@
+import bpy
+import numpy as np
+
+
+# world space bounding boxes of all objects of a scene, keyed by the full scene name, which is unique for linked scenes too
+bounds_index = {}
+
+
+def get_world_bounds(mxs, corners):
+    """
+    return the mins and maxs of (N, 8, 3) local bounding box corners, transformed by (N, 4, 4) world matrices
+    """
+
+    world = np.einsum('nij,nkj->nki', mxs[:, :3, :3], corners) + mxs[:, None, :3, 3]
+
+    return world.min(axis=1), world.max(axis=1)
+
+
+def build_bounds_index(scene):
+    objects = scene.objects
+    count = len(objects)
+
+    # matrices are stored column major
+    mxs = np.empty(count * 16, dtype=np.float64)
+    objects.foreach_get('matrix_world', mxs)
+    mxs = mxs.reshape(count, 4, 4).transpose(0, 2, 1)
+
+    corners = np.empty(count * 24, dtype=np.float64)
+    objects.foreach_get('bound_box', corners)
+    corners = corners.reshape(count, 8, 3)
+
+    mins, maxs = get_world_bounds(mxs, corners)
+
+    index = {'lookup': {obj.name_full: idx for idx, obj in enumerate(objects)},
+             'mins': mins,
+             'maxs': maxs,
+             'dirty': {},
+             'rebuild': False}
+
+    bounds_index[scene.name_full] = index
+
+    return index
+
+
+def update_bounds_index(scene, index):
+    """
+    recalculate the bounds of objects, whose transform or geometry changed since the last query
+    """
+
+    objects = list(index['dirty'].values())
+
+    if any(name not in index['lookup'] for name in index['dirty']):
+        return build_bounds_index(scene)
+
+    if objects:
+        rows = [index['lookup'][name] for name in index['dirty']]
+
+        mxs = np.array([obj.matrix_world for obj in objects], dtype=np.float64)
+        corners = np.array([obj.bound_box for obj in objects], dtype=np.float64)
+
+        index['mins'][rows], index['maxs'][rows] = get_world_bounds(mxs, corners)
+
+    index['dirty'].clear()
+
+    return index
+
+
+def get_bounds_index(scene):
+    """
+    return the bounds index of the scene, built on first use and updated incrementally from there
+    """
+
+    index = bounds_index.get(scene.name_full)
+
+    # objects have been added or removed
+    if not index or index['rebuild'] or len(index['lookup']) != len(scene.objects):
+        return build_bounds_index(scene)
+
+    if index['dirty']:
+        return update_bounds_index(scene, index)
+
+    return index
+
+
+def get_object_bounds(objects, scene=None):
+    """
+    return (N, 3) arrays of the world space bounding box mins and maxs of the passed in objects, in the same order
+    """
+
+    if not scene:
+        scene = bpy.context.scene
+
+    index = get_bounds_index(scene)
+
+    # an object not in the index, like one of another scene
+    if any(obj.name_full not in index['lookup'] for obj in objects):
+        index = build_bounds_index(scene)
+
+    rows = [index['lookup'][obj.name_full] for obj in objects]
+
+    return index['mins'][rows], index['maxs'][rows]
+
+
+def mark_bounds_dirty(scene, depsgraph=None):
+    """
+    flag objects, whose transform or geometry changed, so their bounds are recalculated on the next query
+    without a depsgraph, like on frame changes, which don't report the animated objects, the entire index is rebuilt instead
+    """
+
+    index = bounds_index.get(scene.name_full)
+
+    if index:
+        if depsgraph is None:
+            index['rebuild'] = True
+            return
+
+        for update in depsgraph.updates:
+            if isinstance(update.id, bpy.types.Object):
+                obj = update.id.original
+
+                if obj.name_full not in index['lookup']:
+                    index['rebuild'] = True
+
+                elif update.is_updated_transform or update.is_updated_geometry:
+                    index['dirty'][obj.name_full] = obj
+
+
+def clear_bounds_index():
+    bounds_index.clear()
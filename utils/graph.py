@@ -1,97 +1,300 @@
-import sys
+import bpy
+import heapq
+from collections import OrderedDict
+import zlib
+import numpy as np
+from . mesh import read_array
 
 
-def build_mesh_graph(verts, edges, topo=True):
-    mg = {}
-    for v in verts:
-        mg[v] = []
+# mesh graphs of the most recently used meshes, keyed by mesh name, least recently used first
+graph_cache = OrderedDict()
 
-    for e in edges:
-        distance = 1 if topo else e.calc_length()
+max_cached_graphs = 8
 
-        mg[e.verts[0]].append((e.verts[1], distance))
-        mg[e.verts[1]].append((e.verts[0], distance))
 
-    return mg
+def build_graph(vert_count, indices, lengths=None):
+    """
+    build a compact adjacency graph in compressed sparse row layout from an (edge_count, 2) array of vert indices
+    the neighbours of vert i are neighbours[offsets[i]:offsets[i + 1]], the matching edge lengths are at the same positions in lengths
+    """
+
+    # each edge is walkable in both directions
+    sources = np.concatenate((indices[:, 0], indices[:, 1]))
+    targets = np.concatenate((indices[:, 1], indices[:, 0]))
+
+    # sort the directed edges by source vert, stable to keep the edge order for each vert
+    order = np.argsort(sources, kind='stable')
+
+    offsets = np.zeros(vert_count + 1, dtype=np.int32)
+    np.cumsum(np.bincount(sources, minlength=vert_count), out=offsets[1:])
+
+    neighbours = targets[order].astype(np.int32)
 
+    if lengths is not None:
+        lengths = np.concatenate((lengths, lengths))[order].astype(np.float32)
 
-def get_shortest_path(bm, vstart, vend, topo=False, select=False):
+    return offsets, neighbours, lengths
+
+
+def build_mesh_graph(mesh, topo=True):
     """
-    author: "G Bantle, Bagration, MACHIN3",
-    source: "https://blenderartists.org/forum/showthread.php?58564-Path-Select-script(Update-20060307-Ported-to-C-now-in-CVS",
-    video: https://www.youtube.com/watch?v=_lHSawdgXpI
+    build the adjacency graph of a mesh from its vertex and edge arrays
+    returns the graph and the vert coordinates, with topo the graph has no edge lengths
+
+    the graph is cached and reused as long as the mesh's topology signature, its vert and edge counts and a hash of its edge array, doesn't change
+    edge lengths are kept too, and are only recalculated, when the vert coordinates change
     """
 
-    def dijkstra(mg, vstart, vend, topo=True):
-        # initiate dict to collect distances from stat vert to every other vert
-        d = dict.fromkeys(mg.keys(), sys.maxsize)
+    vert_count = len(mesh.vertices)
+    edge_count = len(mesh.edges)
+
+    coords = read_array(mesh.vertices, 'co', np.float32, 3).reshape(-1, 3)
+    indices = read_array(mesh.edges, 'vertices', np.int32, 2).reshape(-1, 2)
+
+    signature = (vert_count, edge_count, zlib.crc32(indices))
+    entry = graph_cache.get(mesh.name_full)
+
+    if entry and entry['signature'] == signature:
+        graph_cache.move_to_end(mesh.name_full)
+
+    else:
+        offsets, neighbours, _ = build_graph(vert_count, indices)
+        entry = {'signature': signature, 'offsets': offsets, 'neighbours': neighbours, 'coords_signature': None, 'lengths': None}
 
-        # predecessor dict to track the path walked
-        predecessor = dict.fromkeys(mg.keys())
+        graph_cache[mesh.name_full] = entry
 
-        # the distance of the start vert to itself is 0
-        d[vstart] = 0
+        # evict the least recently used graphs
+        while len(graph_cache) > max_cached_graphs:
+            graph_cache.popitem(last=False)
 
-        # keep track of what verts are seen and add the the accumulated distances to those verts
-        unknownverts = [(0, vstart)]
+    offsets, neighbours = entry['offsets'], entry['neighbours']
 
-        # with topo you can exit as soon as you hit the vend, without topo you can't, because the shorter distance my involve more vert hops
-        # while (topo and vstart != vend) or (not topo and unknownverts):
-        while unknownverts:
-            # sorting actually doesn't seem to  be required, but it was in the original source
-            # I question why the list needs to be sorted by index at all. also, doing it via the lambda function is very slow for some reason
-            # unknownverts.sort(key=lambda x: x[1].index)
+    if topo:
+        return (offsets, neighbours, None), coords
 
-            # get the next vert that is closest to vstart
-            dist, vcurrent = unknownverts[0]
+    coords_signature = zlib.crc32(coords)
 
-            # use the mesh graph to retrieve the other verts connected
-            others = mg[vcurrent]
+    if entry['coords_signature'] != coords_signature:
+        # the source vert of each directed edge, the lengths are then in the same order as the neighbours
+        sources = np.repeat(np.arange(vert_count, dtype=np.int32), np.diff(offsets))
 
-            # choose the next vert with the shortest accumulated distance
-            for vother, distance in others:
-                if d[vother] > d[vcurrent] + distance:
-                    d[vother] = d[vcurrent] + distance
+        entry['lengths'] = np.linalg.norm(coords[sources] - coords[neighbours], axis=1).astype(np.float32)
+        entry['coords_signature'] = coords_signature
 
-                    unknownverts.append((d[vother], vother))
-                    predecessor[vother] = vcurrent
+    return (offsets, neighbours, entry['lengths']), coords
 
-            # we've finished exploring this vert, pop it
-            unknownverts.pop(0)
 
-            # you can break out early when determening the topological distances
-            if topo and vcurrent == vend:
-                break
+def clear_graph_cache(prune=False):
+    """
+    with prune, only remove the graphs of meshes, that no longer exist, otherwise remove all
+    """
 
-        # backtrace from the end vertex using the predecessor dict
-        path = []
-        endvert = vend
+    if prune:
+        for name in [name for name in graph_cache if name not in bpy.data.meshes]:
+            del graph_cache[name]
 
-        while endvert is not None:
-            path.append(endvert)
-            endvert = predecessor[endvert]
+    else:
+        graph_cache.clear()
 
-        return reversed(path)
 
-    def f7(seq):
-        seen = set()
-        seen_add = seen.add
-        return [x for x in seq if not (x in seen or seen_add(x))]
+def bidirectional_dijkstra(graph, start, end, region=None, coords=None):
+    """
+    shortest path search over vert indices, running from start and end at the same time, until both searches meet
+    this only settles verts within about half the path length around each end, instead of all verts within the full path length around start
+    with a region mask, only verts inside the region are visited
+
+    with coords, this turns into a bidirectional A*, which requires a graph with edge lengths
+    both searches share the potential of half the difference of the straight line distances to end and to start, which keeps it consistent for both directions
+    """
 
-    verts = [v for v in bm.verts]
-    edges = [e for e in bm.edges]
+    offsets, neighbours, lengths = graph
 
-    mg = build_mesh_graph(verts, edges, topo)
+    startco = coords[start] if coords is not None else None
+    endco = coords[end] if coords is not None else None
 
-    # vert list, shortest dist from vstart to vend
-    path = dijkstra(mg, vstart, vend, topo)
+    # accumulated distances, predecessors, settled verts and the heap of each search direction, forward first
+    d = ({start: 0}, {end: 0})
+    predecessor = ({start: None}, {end: None})
+    settled = (set(), set())
+    unknownverts = ([(0, start)], [(0, end)])
 
-    # remove duplicates, keeps order, see https://stackoverflow.com/a/480227
-    path = f7(path)
+    # length of the shortest path found so far and the vert, where both searches met on it
+    best, meet = (0, start) if start == end else (float('inf'), None)
 
-    # optionally select the path
-    if select:
-        for v in path:
-            v.select = True
+    while unknownverts[0] and unknownverts[1]:
+
+        # no shorter path can be found, once the closest unsettled verts of both searches are further apart than the best path
+        # the potentials of both searches cancel each other out, so this holds for the A* heap keys too
+        if unknownverts[0][0][0] + unknownverts[1][0][0] >= best:
+            break
+
+        # expand the search with the smaller frontier
+        side = 0 if len(unknownverts[0]) <= len(unknownverts[1]) else 1
+        _, current = heapq.heappop(unknownverts[side])
+
+        if current in settled[side]:
+            continue
+
+        settled[side].add(current)
+
+        first, last = offsets[current], offsets[current + 1]
+        others = neighbours[first:last]
+        distances = lengths[first:last] if lengths is not None else np.ones(last - first, dtype=np.int32)
+
+        # stay within the region
+        if region is not None:
+            inside = region[others]
+            others, distances = others[inside], distances[inside]
+
+        # the forward search is directed by the potential, the backward search by its negative, so the heap keys of both add up to a path length
+        if coords is not None:
+            potentials = (np.linalg.norm(coords[others] - endco, axis=1) - np.linalg.norm(coords[others] - startco, axis=1)) / 2
+            potentials = (potentials if side == 0 else -potentials).tolist()
+        else:
+            potentials = [0] * len(others)
+
+        for other, distance, potential in zip(others.tolist(), distances.tolist(), potentials):
+            if other in settled[side]:
+                continue
+
+            dist = d[side][current] + distance
+
+            if dist < d[side].get(other, dist + 1):
+                d[side][other] = dist
+                predecessor[side][other] = current
+
+                heapq.heappush(unknownverts[side], (dist + potential, other))
+
+            # the other search has reached this vert too, so there's a path through it
+            if other in d[1 - side] and d[side][other] + d[1 - side][other] < best:
+                best = d[side][other] + d[1 - side][other]
+                meet = other
+
+    # end can't be reached from start
+    if meet is None:
+        return [end]
+
+    # backtrace from the meeting vert to start, and from the meeting vert to end
+    path = []
+    idx = meet
+
+    while idx is not None:
+        path.append(idx)
+        idx = predecessor[0][idx]
+
+    path.reverse()
+
+    idx = predecessor[1][meet]
+
+    while idx is not None:
+        path.append(idx)
+        idx = predecessor[1][idx]
 
     return path
+
+
+def get_region(graph, seeds, radius):
+    """
+    return a vert mask of the k-ring neighbourhood around the seed verts, where k is the radius in edge hops
+    """
+
+    offsets, neighbours, _ = graph
+
+    region = np.zeros(len(offsets) - 1, dtype=bool)
+
+    frontier = np.unique(np.array(seeds, dtype=np.int32))
+    region[frontier] = True
+
+    for _ in range(radius):
+        starts = offsets[frontier]
+        counts = offsets[frontier + 1] - starts
+
+        # positions of the neighbours of all frontier verts in the neighbours array
+        positions = np.arange(counts.sum()) + np.repeat(starts - (np.cumsum(counts) - counts), counts)
+        others = neighbours[positions]
+
+        frontier = np.unique(others[~region[others]])
+
+        # the region covers the entire mesh island(s) of the seeds
+        if not len(frontier):
+            break
+
+        region[frontier] = True
+
+    return region
+
+
+def bounded_search(graph, start, end, radius, escalation='WIDEN', topo=True, coords=None):
+    """
+    search for the shortest path only within the k-ring region around start and end, and escalate if no path is found
+    WIDEN doubles the radius until a path is found, FULL falls back to searching the entire mesh and NONE gives up
+    """
+
+    regionsize = 0
+
+    while True:
+        region = get_region(graph, (start, end), radius)
+        path = bidirectional_dijkstra(graph, start, end, region=region, coords=coords)
+
+        # an unreachable end is returned as the only vert of the path
+        found = path[0] == start
+
+        # a path of up to 2 * radius + 1 hops is the shortest one, as any path with fewer hops can't leave the region
+        # for length based paths, this doesn't hold, so any path found within the region is used
+        if found and (not topo or len(path) - 1 <= 2 * radius + 1):
+            return path
+
+        if escalation == 'NONE':
+            return path
+
+        elif escalation == 'FULL':
+            return bidirectional_dijkstra(graph, start, end, coords=coords)
+
+        # the region has stopped growing, so widening it further won't change the result
+        if region.sum() == regionsize:
+            return path
+
+        regionsize = region.sum()
+        radius *= 2
+
+
+def get_shortest_paths(mesh, bm, pairs, topo=False, select=False, radius=0, escalation='WIDEN'):
+    """
+    author: "G Bantle, Bagration, MACHIN3",
+    source: "https://blenderartists.org/forum/showthread.php?58564-Path-Select-script(Update-20060307-Ported-to-C-now-in-CVS",
+    video: https://www.youtube.com/watch?v=_lHSawdgXpI
+
+    find the shortest paths between several (vstart, vend) pairs, sharing a single graph build
+    each pair is solved with a bidirectional search, so the work scales with the path lengths rather than the mesh size
+    for length based paths, the straight line distances to both ends direct the searches, see bidirectional_dijkstra()
+    with a radius, each search is bounded to the k-ring region around the pair, see bounded_search()
+
+    the graph is built from mesh, so in edit mode it needs to be synced with bm first, via obj.update_from_editmode()
+    """
+
+    bm.verts.index_update()
+    bm.verts.ensure_lookup_table()
+
+    graph, coords = build_mesh_graph(mesh, topo)
+
+    if topo:
+        coords = None
+
+    paths = []
+
+    for vstart, vend in pairs:
+        if radius:
+            path = bounded_search(graph, vstart.index, vend.index, radius, escalation=escalation, topo=topo, coords=coords)
+        else:
+            path = bidirectional_dijkstra(graph, vstart.index, vend.index, coords=coords)
+
+        path = [bm.verts[idx] for idx in path]
+
+        # optionally select the path
+        if select:
+            for v in path:
+                v.select = True
+
+        paths.append(path)
+
+    return paths
@@ -1,5 +1,6 @@
 from mathutils import Matrix, Vector
 from math import degrees
+import numpy as np
 
 
 def get_center_between_points(point1, point2, center=0.5):
@@ -155,3 +156,73 @@ def get_right_and_up_axes(context, mx):
     flip_up = True if axis_up[0] < 0 else False
 
     return axis_right[1], axis_up[1], flip_right, flip_up
+
+
+# MATRIX ARRAYS
+
+def decompose_matrices(mxs):
+    """
+    decompose an (N, 4, 4) array of matrices into (N, 3) locations, (N, 3, 3) rotation matrices and (N, 3) scales, like Matrix.decompose()
+    """
+
+    locs = mxs[:, :3, 3].copy()
+
+    # the scale is the length of each column
+    scales = np.linalg.norm(mxs[:, :3, :3], axis=1)
+    rots = mxs[:, :3, :3] / np.where(scales == 0, 1, scales)[:, None, :]
+
+    # negative matrices are decomposed into a negated rotation and scale
+    negative = np.linalg.det(rots) < 0
+    rots[negative] *= -1
+    scales[negative] *= -1
+
+    return locs, rots, scales
+
+
+def compose_matrices(locs, rots, scales):
+    """
+    combine (N, 3) locations, (N, 3, 3) rotation matrices and (N, 3) scales into an (N, 4, 4) array of matrices, like loc @ rot @ sca
+    """
+
+    mxs = np.zeros((len(locs), 4, 4))
+    mxs[:, :3, :3] = rots * scales[:, None, :]
+    mxs[:, :3, 3] = locs
+    mxs[:, 3, 3] = 1
+
+    return mxs
+
+
+def get_eulers_from_rotation_matrices(rots):
+    """
+    return the (N, 3) XYZ euler angles of (N, 3, 3) rotation matrices, picking the same one of the two solutions as Matrix.to_euler('XYZ')
+    """
+
+    cy = np.hypot(rots[:, 0, 0], rots[:, 1, 0])
+
+    eul1 = np.stack((np.arctan2(rots[:, 2, 1], rots[:, 2, 2]), np.arctan2(-rots[:, 2, 0], cy), np.arctan2(rots[:, 1, 0], rots[:, 0, 0])), axis=1)
+    eul2 = np.stack((np.arctan2(-rots[:, 2, 1], -rots[:, 2, 2]), np.arctan2(-rots[:, 2, 0], -cy), np.arctan2(-rots[:, 1, 0], -rots[:, 0, 0])), axis=1)
+
+    eulers = np.where((np.abs(eul1).sum(axis=1) > np.abs(eul2).sum(axis=1))[:, None], eul2, eul1)
+
+    # gimbal lock
+    locked = cy <= 16 * np.finfo(np.float32).eps
+    eulers[locked] = np.stack((np.arctan2(-rots[locked, 1, 2], rots[locked, 1, 1]), np.arctan2(-rots[locked, 2, 0], cy[locked]), np.zeros(locked.sum())), axis=1)
+
+    return eulers
+
+
+def get_rotation_matrices_from_eulers(eulers):
+    """
+    return the (N, 3, 3) rotation matrices of (N, 3) XYZ euler angles
+    """
+
+    cx, cy, cz = np.cos(eulers).T
+    sx, sy, sz = np.sin(eulers).T
+
+    rots = np.empty((len(eulers), 3, 3))
+
+    rots[:, 0] = np.stack((cy * cz, sx * sy * cz - cx * sz, cx * sy * cz + sx * sz), axis=1)
+    rots[:, 1] = np.stack((cy * sz, sx * sy * sz + cx * cz, cx * sy * sz - sx * cz), axis=1)
+    rots[:, 2] = np.stack((-sy, sx * cy, cx * cy), axis=1)
+
+    return rots
@@ -1,9 +1,18 @@
 import bpy
 import bmesh
 from mathutils import Vector, Matrix
+from mathutils.bvhtree import BVHTree
+from mathutils.kdtree import KDTree
 import numpy as np
 
 
+# quadsphere vert coordinates and face indices per subdivision level
+quadsphere_cache = {}
+
+# kd trees of the non-manifold verts of edit meshes, keyed by mesh name
+boundary_cache = {}
+
+
 def get_coords(mesh, mx=None, offset=0, indices=False):
     verts = mesh.vertices
     vert_count = len(verts)
@@ -42,6 +51,96 @@ def get_coords(mesh, mx=None, offset=0, indices=False):
     return coords
 
 
+def get_quadsphere_data(subdivisions):
+    """
+    return the vert coordinates and the (F, 4) face vert indices of a unit radius quadsphere
+    each cube face is subdivided into a 2^subdivisions grid, where new verts are put at the normalized edge and face midpoints of the previous level
+    the results are cached per level
+    """
+
+    if subdivisions in quadsphere_cache:
+        return quadsphere_cache[subdivisions]
+
+    size = 2 ** subdivisions
+
+    # cube faces as origin corner and u, v axes, with u x v pointing outwards
+    cubefaces = [((1, -1, -1), (0, 2, 0), (0, 0, 2)),
+                 ((-1, -1, -1), (0, 0, 2), (0, 2, 0)),
+                 ((-1, 1, -1), (0, 0, 2), (2, 0, 0)),
+                 ((-1, -1, -1), (2, 0, 0), (0, 0, 2)),
+                 ((-1, -1, 1), (2, 0, 0), (0, 2, 0)),
+                 ((-1, -1, -1), (0, 2, 0), (2, 0, 0))]
+
+    def normalize(vectors):
+        return vectors / np.linalg.norm(vectors, axis=-1)[..., None]
+
+    coords = []
+    lattice = []
+
+    for origin, u, v in cubefaces:
+        origin, u, v = np.array(origin), np.array(u), np.array(v)
+
+        # grid of the face's corner positions, indexed by u and v
+        grid = normalize(np.array([[origin, origin + v], [origin + u, origin + u + v]], dtype=np.float64))
+
+        for _ in range(subdivisions):
+            count = len(grid)
+            new = np.empty((count * 2 - 1, count * 2 - 1, 3))
+
+            new[::2, ::2] = grid
+            new[1::2, ::2] = normalize(grid[:-1] + grid[1:])
+            new[::2, 1::2] = normalize(grid[:, :-1] + grid[:, 1:])
+            new[1::2, 1::2] = normalize(grid[:-1, :-1] + grid[1:, :-1] + grid[:-1, 1:] + grid[1:, 1:])
+
+            grid = new
+
+        coords.append(grid.reshape(-1, 3))
+
+        # integer positions of the grid verts on the cube surface, used to find the verts shared by neighbouring faces
+        i, j = np.meshgrid(np.arange(size + 1), np.arange(size + 1), indexing='ij')
+        lattice.append((origin + 1) // 2 * size + (u // 2) * i.reshape(-1, 1) + (v // 2) * j.reshape(-1, 1))
+
+    coords = np.concatenate(coords)
+    lattice = np.concatenate(lattice)
+
+    keys = (lattice[:, 0] * (size + 1) + lattice[:, 1]) * (size + 1) + lattice[:, 2]
+    _, unique, inverse = np.unique(keys, return_index=True, return_inverse=True)
+
+    # quads of each face grid, counter clockwise in u, v
+    i, j = np.meshgrid(np.arange(size), np.arange(size), indexing='ij')
+    first = (i * (size + 1) + j).reshape(-1)
+    quads = np.stack((first, first + size + 1, first + size + 2, first + 1), axis=1)
+
+    gridsize = (size + 1) ** 2
+    faces = np.concatenate([quads + idx * gridsize for idx in range(len(cubefaces))])
+
+    quadsphere_cache[subdivisions] = coords[unique].astype(np.float32), inverse.reshape(-1)[faces].astype(np.int32)
+
+    return quadsphere_cache[subdivisions]
+
+
+def create_mesh_from_quads(name, coords, faces):
+    """
+    create a new mesh from vert coordinates and (F, 4) face vert indices, directly via foreach_set
+    """
+
+    mesh = bpy.data.meshes.new(name)
+
+    mesh.vertices.add(len(coords))
+    mesh.vertices.foreach_set('co', coords.reshape(-1))
+
+    mesh.loops.add(faces.size)
+    mesh.loops.foreach_set('vertex_index', faces.reshape(-1))
+
+    mesh.polygons.add(len(faces))
+    mesh.polygons.foreach_set('loop_start', np.arange(0, faces.size, 4, dtype=np.int32))
+    mesh.polygons.foreach_set('loop_total', np.full(len(faces), 4, dtype=np.int32))
+
+    mesh.update(calc_edges=True)
+
+    return mesh
+
+
 # MESH
 
 def hide(mesh):
@@ -153,7 +252,81 @@ def flip_normals(mesh):
     bm.free()
 
 
-def join(target, objects, select=[]):
+def get_2_edged_vert_coords(verts):
+    """
+    return the 2-edged verts, and an array of their coordinates and those of their two neighbours
+    """
+
+    two_edged = [v for v in verts if len(v.link_edges) == 2]
+
+    coords = np.array([(v.co, v.link_edges[0].other_vert(v).co, v.link_edges[1].other_vert(v).co) for v in two_edged]).reshape(-1, 3, 3)
+
+    return two_edged, coords
+
+
+def get_straight_mask(coords, min_angle=179):
+    """
+    for an array of vert and neighbour coordinates as returned by get_2_edged_vert_coords(), return a mask of verts, whose edges form an angle of at least min_angle degrees
+    """
+
+    vectors1 = coords[:, 1] - coords[:, 0]
+    vectors2 = coords[:, 2] - coords[:, 0]
+
+    # zero length edges have no angle, their nan angles won't pass the threshold
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cos = np.einsum('ij,ij->i', vectors1, vectors2) / (np.linalg.norm(vectors1, axis=1) * np.linalg.norm(vectors2, axis=1))
+        angles = np.degrees(np.arccos(np.clip(cos, -1, 1)))
+
+        return angles >= min_angle
+
+
+def get_straight_2_edged_verts(verts, min_angle=179):
+    """
+    return the 2-edged verts, whose edges form an angle of at least min_angle degrees
+    the angles of all 2-edged verts are calculated in a single vectorised pass
+    """
+
+    two_edged, coords = get_2_edged_vert_coords(verts)
+
+    return [v for v, straight in zip(two_edged, get_straight_mask(coords, min_angle)) if straight]
+
+
+def read_array(collection, attr, dtype, size=1):
+    array = np.empty(len(collection) * size, dtype=dtype)
+    collection.foreach_get(attr, array)
+
+    return array
+
+
+def get_loop_faces(loop_start, loop_total):
+    """
+    return the face index of each loop
+    the loops of each face are stored consecutively, but the faces aren't necessarily in the same order as their loops
+    """
+
+    order = np.argsort(loop_start)
+
+    return np.repeat(order.astype(np.int32), loop_total[order])
+
+
+def enable_edge_customdata(mesh, meshes):
+    """
+    edge bevel weights and creases are dropped when entering edit mode, unless the mesh's customdata flags are set, so set them if any of the meshes uses them
+    """
+
+    if any([m.use_customdata_edge_bevel for m in meshes]):
+        mesh.use_customdata_edge_bevel = True
+
+    if any([m.use_customdata_edge_crease for m in meshes]):
+        mesh.use_customdata_edge_crease = True
+
+
+def join_bmesh(target, objects, select=[]):
+    """
+    join the meshes of objects into the target mesh, by appending them to a bmesh of the target, which keeps the target's shape keys in sync
+    the faces are tagged with the object's index + 1 in the int face layer, and the faces of objects with indices in select are selected
+    """
+
     mxi = target.matrix_world.inverted()
 
     bm = bmesh.new()
@@ -195,3 +368,404 @@ def join(target, objects, select=[]):
 
     bm.to_mesh(target.data)
     bm.clear()
+
+
+def join(target, objects, select=[]):
+    """
+    join the meshes of objects into the target mesh, by concatenating their vertex, edge, loop and polygon arrays and writing them in one go
+    the faces are tagged with the object's index + 1 in the int face layer, and the faces of objects with indices in select are selected
+    uvs, vertex colors, seams, sharp edges, creases, bevel weights, materials and smooth flags are joined, custom normals and vertex group weights are not
+    adding verts doesn't resize the target's shape keys, so targets with shape keys are joined via bmesh instead, see join_bmesh()
+    """
+
+    if target.data.shape_keys:
+        return join_bmesh(target, objects, select=select)
+
+    mesh = target.data
+    mxi = np.array(target.matrix_world.inverted())
+
+    if any([obj.data.use_auto_smooth for obj in objects]):
+        mesh.use_auto_smooth = True
+
+    enable_edge_customdata(mesh, [obj.data for obj in objects])
+
+    # the int face layer, the target's own faces keep their values, or are 0 if the layer is new
+    if not mesh.polygon_layers_int:
+        mesh.polygon_layers_int.new()
+
+    for obj in objects:
+        for uv in obj.data.uv_layers:
+            if uv.name not in mesh.uv_layers:
+                mesh.uv_layers.new(name=uv.name)
+
+        for vc in obj.data.vertex_colors:
+            if vc.name not in mesh.vertex_colors:
+                mesh.vertex_colors.new(name=vc.name)
+
+    uvnames = [uv.name for uv in mesh.uv_layers]
+    vcnames = [vc.name for vc in mesh.vertex_colors]
+
+    def read_arrays(m):
+        return {'co': read_array(m.vertices, 'co', np.float32, 3).reshape(-1, 3),
+                'vertices': read_array(m.edges, 'vertices', np.int32, 2),
+                'use_seam': read_array(m.edges, 'use_seam', bool),
+                'use_edge_sharp': read_array(m.edges, 'use_edge_sharp', bool),
+                'crease': read_array(m.edges, 'crease', np.float32),
+                'bevel_weight': read_array(m.edges, 'bevel_weight', np.float32),
+                'vertex_index': read_array(m.loops, 'vertex_index', np.int32),
+                'edge_index': read_array(m.loops, 'edge_index', np.int32),
+                'loop_start': read_array(m.polygons, 'loop_start', np.int32),
+                'loop_total': read_array(m.polygons, 'loop_total', np.int32),
+                'material_index': read_array(m.polygons, 'material_index', np.int32),
+                'use_smooth': read_array(m.polygons, 'use_smooth', bool),
+                'uvs': {name: read_array(m.uv_layers[name].data, 'uv', np.float32, 2) if name in m.uv_layers else np.zeros(len(m.loops) * 2, dtype=np.float32) for name in uvnames},
+                'vcs': {name: read_array(m.vertex_colors[name].data, 'color', np.float32, 4) if name in m.vertex_colors else np.ones(len(m.loops) * 4, dtype=np.float32) for name in vcnames}}
+
+    arrays = [read_arrays(mesh)]
+    tags = [read_array(mesh.polygon_layers_int[0].data, 'value', np.int32)]
+
+    vert_count, edge_count, loop_count = len(mesh.vertices), len(mesh.edges), len(mesh.loops)
+
+    for idx, obj in enumerate(objects):
+        source = read_arrays(obj.data)
+
+        # bring the coordinates into the target's local space
+        mx = mxi @ np.array(obj.matrix_world)
+        source['co'] = source['co'] @ mx[:3, :3].T + mx[:3, 3]
+
+        # offset the indices by the number of elements before the source
+        source['vertices'] += vert_count
+        source['vertex_index'] += vert_count
+        source['edge_index'] += edge_count
+        source['loop_start'] += loop_count
+
+        vert_count += len(obj.data.vertices)
+        edge_count += len(obj.data.edges)
+        loop_count += len(obj.data.loops)
+
+        arrays.append(source)
+        tags.append(np.full(len(obj.data.polygons), idx + 1, dtype=np.int32))
+
+        bpy.data.meshes.remove(obj.data, do_unlink=True)
+
+    def concat(attr):
+        return np.concatenate([a[attr] for a in arrays])
+
+    face_tags = np.concatenate(tags)
+
+    mesh.vertices.add(vert_count - len(mesh.vertices))
+    mesh.edges.add(edge_count - len(mesh.edges))
+    mesh.loops.add(loop_count - len(mesh.loops))
+    mesh.polygons.add(len(face_tags) - len(mesh.polygons))
+
+    mesh.vertices.foreach_set('co', concat('co').reshape(-1))
+
+    for attr in ['vertices', 'use_seam', 'use_edge_sharp', 'crease', 'bevel_weight']:
+        mesh.edges.foreach_set(attr, concat(attr))
+
+    for attr in ['vertex_index', 'edge_index']:
+        mesh.loops.foreach_set(attr, concat(attr))
+
+    for attr in ['loop_start', 'loop_total', 'material_index', 'use_smooth']:
+        mesh.polygons.foreach_set(attr, concat(attr))
+
+    for name in uvnames:
+        mesh.uv_layers[name].data.foreach_set('uv', np.concatenate([a['uvs'][name] for a in arrays]))
+
+    for name in vcnames:
+        mesh.vertex_colors[name].data.foreach_set('color', np.concatenate([a['vcs'][name] for a in arrays]))
+
+    mesh.polygon_layers_int[0].data.foreach_set('value', face_tags)
+
+    if select:
+        face_select = read_array(mesh.polygons, 'select', bool) | np.isin(face_tags, select)
+
+        # select the verts and edges of the selected faces as well
+        loop_select = face_select[get_loop_faces(concat('loop_start'), concat('loop_total'))]
+
+        vert_select = read_array(mesh.vertices, 'select', bool)
+        vert_select[concat('vertex_index')[loop_select]] = True
+
+        edge_select = read_array(mesh.edges, 'select', bool)
+        edge_select[concat('edge_index')[loop_select]] = True
+
+        mesh.vertices.foreach_set('select', vert_select)
+        mesh.edges.foreach_set('select', edge_select)
+        mesh.polygons.foreach_set('select', face_select)
+
+    mesh.update()
+
+
+def create_mesh_from_faces(name, mesh, faces):
+    """
+    create a new mesh from the faces in the passed in mask, copying their verts, edges, uvs, vertex colors, materials and custom normals
+    shape keys and vertex group weights aren't part of the mesh arrays, use the returned vert indices to copy them
+    return the new mesh and the indices of the verts in the source mesh they were copied from
+    """
+
+    loop_verts = read_array(mesh.loops, 'vertex_index', np.int32)
+    loop_edges = read_array(mesh.loops, 'edge_index', np.int32)
+    loop_start = read_array(mesh.polygons, 'loop_start', np.int32)
+    loop_total = read_array(mesh.polygons, 'loop_total', np.int32)
+
+    # the selected faces and their loops, in loop order
+    indices = np.flatnonzero(faces)
+    indices = indices[np.argsort(loop_start[indices])]
+
+    loops = np.flatnonzero(faces[get_loop_faces(loop_start, loop_total)])
+
+    # the verts and edges used by the faces, and the maps from old to new indices
+    verts = np.unique(loop_verts[loops])
+    vert_map = np.full(len(mesh.vertices), -1, dtype=np.int32)
+    vert_map[verts] = np.arange(len(verts), dtype=np.int32)
+
+    edges = np.unique(loop_edges[loops])
+    edge_map = np.full(len(mesh.edges), -1, dtype=np.int32)
+    edge_map[edges] = np.arange(len(edges), dtype=np.int32)
+
+    new = bpy.data.meshes.new(name)
+
+    new.vertices.add(len(verts))
+    new.vertices.foreach_set('co', read_array(mesh.vertices, 'co', np.float32, 3).reshape(-1, 3)[verts].reshape(-1))
+
+    new.edges.add(len(edges))
+    new.edges.foreach_set('vertices', vert_map[read_array(mesh.edges, 'vertices', np.int32, 2).reshape(-1, 2)[edges]].reshape(-1))
+
+    for attr in ['use_seam', 'use_edge_sharp']:
+        new.edges.foreach_set(attr, read_array(mesh.edges, attr, bool)[edges])
+
+    for attr in ['crease', 'bevel_weight']:
+        new.edges.foreach_set(attr, read_array(mesh.edges, attr, np.float32)[edges])
+
+    new.loops.add(len(loops))
+    new.loops.foreach_set('vertex_index', vert_map[loop_verts[loops]])
+    new.loops.foreach_set('edge_index', edge_map[loop_edges[loops]])
+
+    totals = loop_total[indices]
+
+    new.polygons.add(len(indices))
+    new.polygons.foreach_set('loop_start', (np.cumsum(totals) - totals).astype(np.int32))
+    new.polygons.foreach_set('loop_total', totals)
+    new.polygons.foreach_set('material_index', read_array(mesh.polygons, 'material_index', np.int32)[indices])
+    new.polygons.foreach_set('use_smooth', read_array(mesh.polygons, 'use_smooth', bool)[indices])
+
+    for uv in mesh.uv_layers:
+        layer = new.uv_layers.new(name=uv.name)
+        layer.data.foreach_set('uv', read_array(uv.data, 'uv', np.float32, 2).reshape(-1, 2)[loops].reshape(-1))
+
+    for vc in mesh.vertex_colors:
+        layer = new.vertex_colors.new(name=vc.name)
+        layer.data.foreach_set('color', read_array(vc.data, 'color', np.float32, 4).reshape(-1, 4)[loops].reshape(-1))
+
+    for mat in mesh.materials:
+        new.materials.append(mat)
+
+    new.use_auto_smooth = mesh.use_auto_smooth
+    new.auto_smooth_angle = mesh.auto_smooth_angle
+
+    enable_edge_customdata(new, [mesh])
+
+    new.update()
+
+    if mesh.has_custom_normals:
+        mesh.calc_normals_split()
+        normals = read_array(mesh.loops, 'normal', np.float32, 3).reshape(-1, 3)[loops]
+        mesh.free_normals_split()
+
+        new.normals_split_custom_set(normals)
+
+    return new, verts
+
+
+def get_face_polygons(loop_verts, loop_start, loop_total, faces):
+    """
+    return the vertex coordinate indices and polygons of the passed in face indices, remapped to only the verts they use
+    """
+
+    polygons = [loop_verts[start:start + total] for start, total in zip(loop_start[faces], loop_total[faces])]
+
+    if not polygons:
+        return np.empty(0, dtype=np.int32), []
+
+    indices, inverse = np.unique(np.concatenate(polygons), return_inverse=True)
+    splits = np.cumsum(loop_total[faces])[:-1]
+
+    return indices, [p.tolist() for p in np.split(inverse, splits)]
+
+
+def get_intersecting_faces(mesh, margin=0.0001):
+    """
+    return a mask of the faces tagged 0 in the int face layer, that can intersect faces tagged > 0, like the target and cutter faces of a join
+    bounding boxes are compared first, and only the faces overlapping a cutter's bounding box are then checked against a BVH tree of the cutter faces
+    """
+
+    co = read_array(mesh.vertices, 'co', np.float32, 3).reshape(-1, 3)
+    loop_verts = read_array(mesh.loops, 'vertex_index', np.int32)
+    loop_start = read_array(mesh.polygons, 'loop_start', np.int32)
+    loop_total = read_array(mesh.polygons, 'loop_total', np.int32)
+    tags = read_array(mesh.polygon_layers_int[0].data, 'value', np.int32)
+
+    mask = np.zeros(len(tags), dtype=bool)
+
+    if not len(tags):
+        return mask
+
+    # per face bounding boxes, reduced over the consecutive loops of each face
+    starts = np.sort(loop_start)
+    faces = get_loop_faces(loop_start, loop_total)[starts]
+    face_co = co[loop_verts]
+
+    mins = np.empty((len(tags), 3), dtype=np.float32)
+    maxs = np.empty((len(tags), 3), dtype=np.float32)
+    mins[faces] = np.minimum.reduceat(face_co, starts, axis=0)
+    maxs[faces] = np.maximum.reduceat(face_co, starts, axis=0)
+
+    target = tags == 0
+
+    for tag in np.unique(tags[~target]):
+        cutter = tags == tag
+        cmin = mins[cutter].min(axis=0) - margin
+        cmax = maxs[cutter].max(axis=0) + margin
+
+        mask |= target & np.all(maxs >= cmin, axis=1) & np.all(mins <= cmax, axis=1)
+
+    candidates = np.flatnonzero(mask)
+
+    if not len(candidates):
+        return mask
+
+    # refine the candidates by looking for cutter faces within the margin of the sphere around each candidate's bounding box
+    # unlike an exact triangle overlap test, this keeps touching and coplanar faces as well, which the intersection has to cut too
+    cutters = np.flatnonzero(~target)
+
+    indices, polygons = get_face_polygons(loop_verts, loop_start, loop_total, cutters)
+    cutter_tree = BVHTree.FromPolygons(co[indices].tolist(), polygons)
+
+    centers = (mins[candidates] + maxs[candidates]) / 2
+    radii = np.linalg.norm(maxs[candidates] - mins[candidates], axis=1) / 2 + margin
+
+    near = [cutter_tree.find_nearest(center, radius)[0] is not None for center, radius in zip(centers.tolist(), radii.tolist())]
+
+    mask[candidates[~np.array(near, dtype=bool)]] = False
+
+    return mask
+
+
+def hide_faces(mesh, mask):
+    """
+    hide the faces in the mask, as well as the verts and edges, that aren't used by any of the remaining visible faces
+    """
+
+    loop_verts = read_array(mesh.loops, 'vertex_index', np.int32)
+    loop_edges = read_array(mesh.loops, 'edge_index', np.int32)
+    loop_start = read_array(mesh.polygons, 'loop_start', np.int32)
+    loop_total = read_array(mesh.polygons, 'loop_total', np.int32)
+
+    loop_visible = ~mask[get_loop_faces(loop_start, loop_total)]
+
+    vert_hide = np.ones(len(mesh.vertices), dtype=bool)
+    vert_hide[loop_verts[loop_visible]] = False
+
+    edge_hide = np.ones(len(mesh.edges), dtype=bool)
+    edge_hide[loop_edges[loop_visible]] = False
+
+    mesh.vertices.foreach_set('hide', vert_hide)
+    mesh.edges.foreach_set('hide', edge_hide)
+    mesh.polygons.foreach_set('hide', mask)
+
+    mesh.update()
+
+
+# BOUNDARY
+
+def is_non_manifold(v):
+    return any(not e.is_manifold for e in v.link_edges)
+
+
+def get_bm_counts(bm):
+    return len(bm.verts), len(bm.edges), len(bm.faces)
+
+
+def get_boundary_coords(bm, indices):
+    return np.array([bm.verts[idx].co for idx in indices], dtype=np.float64).reshape(-1, 3)
+
+
+def build_boundary_tree(mesh, bm):
+    bm.verts.index_update()
+    bm.verts.ensure_lookup_table()
+
+    indices = [v.index for v in bm.verts if is_non_manifold(v)]
+    coords = get_boundary_coords(bm, indices)
+
+    tree = KDTree(len(indices))
+
+    for idx, co in zip(indices, coords.tolist()):
+        tree.insert(co, idx)
+
+    tree.balance()
+
+    entry = {'tree': tree,
+             'indices': indices,
+             'coords': coords,
+             'vert_count': len(bm.verts),
+             'counts': get_bm_counts(bm)}
+
+    boundary_cache[mesh.name_full] = entry
+
+    return entry
+
+
+def get_boundary_tree(mesh, bm):
+    """
+    return the cached kd tree of the non-manifold verts of the mesh
+    it's rebuilt if the topology has changed since it was last used, or if any of the verts in it has been moved since
+    """
+
+    entry = boundary_cache.get(mesh.name_full)
+
+    if not entry or entry['counts'] != get_bm_counts(bm):
+        return build_boundary_tree(mesh, bm)
+
+    bm.verts.ensure_lookup_table()
+
+    if not np.array_equal(get_boundary_coords(bm, entry['indices']), entry['coords']):
+        return build_boundary_tree(mesh, bm)
+
+    return entry
+
+
+def keep_boundary_tree(mesh, bm, counts):
+    """
+    keep using the cached kd tree after adding geometry, if it was up to date for the passed in counts before
+    verts added since the tree was built are checked separately, removing verts shifts the indices, so the tree shouldn't be kept then
+    """
+
+    entry = boundary_cache.get(mesh.name_full)
+
+    if entry and entry['counts'] == counts:
+        entry['counts'] = get_bm_counts(bm)
+
+
+def get_closest_boundary_vert(mesh, bm, co, distance, exclude=[]):
+    """
+    return the closest non-manifold vert within distance of co, that isn't in exclude, or None
+    only verts in the kd tree and verts added since it was built are checked
+    """
+
+    entry = get_boundary_tree(mesh, bm)
+    bm.verts.ensure_lookup_table()
+
+    candidates = [(dist, bm.verts[idx]) for _, idx, dist in entry['tree'].find_range(co, distance)]
+
+    # verts created since the tree was built
+    for v in bm.verts[entry['vert_count']:]:
+        candidates.append(((v.co - co).length, v))
+
+    candidates = [(dist, v) for dist, v in candidates if dist < distance and v not in exclude and is_non_manifold(v)]
+
+    if candidates:
+        return min(candidates, key=lambda x: x[0])[1]
+
+
+def clear_boundary_cache():
+    boundary_cache.clear()
@@ -1,3 +1,51 @@
+import bpy
+import bmesh
+import numpy as np
+from . graph import build_graph
+
+
+# selection stats of meshes in edit mode, keyed by mesh name
+selection_stats = {}
+
+# owner of the msgbus subscriptions, that clear the selection stats
+msgbus_owner = object()
+
+
+def get_selection_stats(obj):
+    """
+    return the selected vert, edge and face counts, whether faces are selected and the length of the select history of an object in edit mode
+    the stats are cached until the next depsgraph update, select mode or object mode change, so polls can read them in constant time
+    """
+
+    mesh = obj.data
+    stats = selection_stats.get(mesh.name_full)
+
+    if stats is None:
+        bm = bmesh.from_edit_mesh(mesh)
+
+        stats = {'verts': mesh.total_vert_sel,
+                 'edges': mesh.total_edge_sel,
+                 'faces': mesh.total_face_sel,
+                 'has_faces': mesh.total_face_sel > 0,
+                 'history': len(bm.select_history)}
+
+        selection_stats[mesh.name_full] = stats
+
+    return stats
+
+
+def clear_selection_stats(*args):
+    selection_stats.clear()
+
+
+def subscribe_selection_stats():
+    for key in [(bpy.types.ToolSettings, "mesh_select_mode"), (bpy.types.Object, "mode")]:
+        bpy.msgbus.subscribe_rna(key=key, owner=msgbus_owner, args=(), notify=clear_selection_stats)
+
+
+def unsubscribe_selection_stats():
+    bpy.msgbus.clear_by_owner(msgbus_owner)
+    clear_selection_stats()
 
 
 def get_selected_vert_sequences(verts, ensure_seq_len=False, debug=False):
@@ -6,63 +54,60 @@ def get_selected_vert_sequences(verts, ensure_seq_len=False, debug=False):
     """
     sequences = []
 
-    # if edge loops are non-cyclic, it matters at what vert you start the sorting
-    noncyclicstartverts = [v for v in verts if len([e for e in v.link_edges if e.select]) == 1]
+    if not verts:
+        return sequences
 
-    if noncyclicstartverts:
-        v = noncyclicstartverts[0]
+    # local indices of the verts, and the selected edges between them, read once, in link edge order
+    vertmap = {v: idx for idx, v in enumerate(verts)}
 
-    # in cyclic edge loops, any vert works
-    else:
-        v = verts[0]
+    seen = set()
+    indices = []
 
-    seq = []
+    for v in verts:
+        for e in v.link_edges:
+            if e.select and e not in seen:
+                other = e.other_vert(v)
 
-    while verts:
-        seq.append(v)
+                if other in vertmap:
+                    seen.add(e)
+                    indices.append((vertmap[v], vertmap[other]))
 
-        # safty precaution,for EPanel, where people may select intersecting edge loops
-        if v not in verts:
-            break
+    offsets, neighbours, _ = build_graph(len(verts), np.array(indices, dtype=np.int32).reshape(-1, 2))
 
-        else:
-            verts.remove(v)
+    # degree of each vert, in terms of selected edges
+    degrees = np.diff(offsets).tolist()
 
-        if v in noncyclicstartverts:
-            noncyclicstartverts.remove(v)
+    offsets = offsets.tolist()
+    neighbours = neighbours.tolist()
 
-        nextv = [e.other_vert(v) for e in v.link_edges if e.select and e.other_vert(v) not in seq]
+    visited = [False] * len(verts)
 
-        # next vert in sequence
-        if nextv:
-            v = nextv[0]
+    # if edge loops are non-cyclic, it matters at what vert you start the sorting, in cyclic edge loops, any vert works
+    startverts = [idx for idx, degree in enumerate(degrees) if degree == 1] + list(range(len(verts)))
 
-        # finished a sequence
-        else:
-            # determine cyclicity
-            cyclic = True if len([e for e in v.link_edges if e.select]) == 2 else False
+    for start in startverts:
+        if visited[start]:
+            continue
 
-            # store sequence and cyclicity
-            sequences.append((seq, cyclic))
+        seq = []
+        idx = start
 
-            # start a new sequence, if there are still verts left
-            if verts:
-                if noncyclicstartverts:
-                    v = noncyclicstartverts[0]
-                else:
-                    v = verts[0]
+        while idx is not None:
+            seq.append(idx)
+            visited[idx] = True
 
-                seq = []
+            # next vert in sequence, verts already in a sequence are skipped, as people may select intersecting edge loops, like for EPanel
+            idx = next((other for other in neighbours[offsets[idx]:offsets[idx + 1]] if not visited[other]), None)
 
-    # again for EPanel, make sure sequences are longer than one vert
-    if ensure_seq_len:
-        seqs = []
+        # determine cyclicity
+        cyclic = degrees[seq[-1]] == 2
 
-        for seq, cyclic in sequences:
-            if len(seq) > 1:
-                seqs.append((seq, cyclic))
+        # store sequence and cyclicity
+        sequences.append(([verts[idx] for idx in seq], cyclic))
 
-        sequences = seqs
+    # again for EPanel, make sure sequences are longer than one vert
+    if ensure_seq_len:
+        sequences = [(seq, cyclic) for seq, cyclic in sequences if len(seq) > 1]
 
     if debug:
         for seq, cyclic in sequences: